@@ -12,12 +12,12 @@ import numpy as np
 import pandas as pd
 
 from facility_registry.io import load_config
+from facility_registry.stage_cache import parse_stage_args, run_stage
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
 
 
-def main() -> None:
-    cfg = load_config()
+def build(cfg: dict) -> None:
     rng = np.random.default_rng(cfg["random_seed"])
 
     countries = [
@@ -96,5 +96,20 @@ def main() -> None:
     logging.info("Generated raw dataset with %s rows", len(out))
 
 
+def main() -> None:
+    args = parse_stage_args("Generate the synthetic raw dataset.")
+    cfg = load_config()
+    run_stage(
+        "generate",
+        lambda: build(cfg),
+        inputs=[],
+        outputs=["data/raw/facilities_raw.csv"],
+        params={"random_seed": cfg["random_seed"]},
+        cache_cfg=cfg.get("stage_cache"),
+        force=args.force,
+        code_paths=[__file__],
+    )
+
+
 if __name__ == "__main__":
     main()
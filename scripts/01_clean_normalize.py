@@ -8,19 +8,21 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 import logging
 from pathlib import Path
 
-import pandas as pd
-
 from facility_registry.dedupe import deduplicate
+from facility_registry.ingest import DEFAULT_MAPPING_CACHE, ColumnMappingCache, discover_sources, ingest_sources
 from facility_registry.io import load_config
-from facility_registry.normalize import normalize_dataframe
+from facility_registry.stage_cache import package_modules, parse_stage_args, run_stage
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
 
 
-def main() -> None:
-    cfg = load_config()
-    raw = pd.read_csv("data/raw/facilities_raw.csv")
-    cleaned, out_of_range_fixes = normalize_dataframe(raw)
+def build(cfg: dict, sources: list[Path], mapping_cache: ColumnMappingCache) -> None:
+    cleaned, out_of_range_fixes = ingest_sources(
+        sources,
+        backend=cfg.get("backend", "pandas"),
+        max_workers=cfg.get("ingest", {}).get("max_workers"),
+        mapping_cache=mapping_cache,
+    )
     cleaned["raw_lat"] = cleaned["lat"]
     cleaned["raw_lon"] = cleaned["lon"]
     deduped = deduplicate(cleaned, cfg["dedupe_thresholds"])
@@ -31,5 +33,27 @@ def main() -> None:
     logging.info("Wrote cleaned dataset to data/interim/cleaned_facilities.csv")
 
 
+def main() -> None:
+    args = parse_stage_args("Normalize and deduplicate raw facility records.")
+    cfg = load_config()
+    ingest_cfg = cfg.get("ingest", {})
+    sources = discover_sources(ingest_cfg.get("raw_dir", "data/raw"), ingest_cfg.get("pattern", "*.csv"))
+    # Resolve new headers before keying the stage so the mapping file is a stable input;
+    # hand edits to it then invalidate the stage like any other input.
+    mapping_path = ingest_cfg.get("mapping_cache", DEFAULT_MAPPING_CACHE)
+    mapping_cache = ColumnMappingCache(mapping_path)
+    mapping_cache.resolve_files(sources, cfg.get("backend", "pandas"))
+    run_stage(
+        "normalize",
+        lambda: build(cfg, sources, mapping_cache),
+        inputs=[*sources, mapping_path],
+        outputs=["data/interim/cleaned_facilities.csv"],
+        params={"dedupe_thresholds": cfg["dedupe_thresholds"], "backend": cfg.get("backend", "pandas")},
+        cache_cfg=cfg.get("stage_cache"),
+        force=args.force,
+        code_paths=[__file__, *package_modules("__init__", "normalize", "ingest", "dedupe", "lazy", "io")],
+    )
+
+
 if __name__ == "__main__":
     main()
@@ -10,22 +10,42 @@ import os
 
 import pandas as pd
 
+from facility_registry.boundaries import COUNTRIES_PATH, check_country_consistency
 from facility_registry.geocode import apply_geocoding
 from facility_registry.io import load_config
+from facility_registry.stage_cache import package_modules, parse_stage_args, run_stage
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
 
 
-def main() -> None:
-    cfg = load_config()
-    online_env = os.getenv("ENABLE_ONLINE_GEOCODE", "false").lower() in {"1", "true", "yes"}
-    online_enabled = bool(cfg.get("online_geocode_enabled", False) and online_env)
-
+def build(online_enabled: bool, tolerance_deg: float) -> None:
     df = pd.read_csv("data/interim/cleaned_facilities.csv")
     out = apply_geocoding(df, "caches/geocoding_cache.csv", online_enabled=online_enabled)
+    out = check_country_consistency(out, tolerance_deg)
+    mismatches = int(out["country_mismatch"].sum())
+    if mismatches:
+        logging.warning("%s rows have coordinates outside their country_iso2", mismatches)
     out.to_csv("data/interim/cleaned_facilities.csv", index=False)
     logging.info("Applied geocoding with online_enabled=%s", online_enabled)
 
 
+def main() -> None:
+    args = parse_stage_args("Fill missing coordinates from the geocoding cache.")
+    cfg = load_config()
+    online_env = os.getenv("ENABLE_ONLINE_GEOCODE", "false").lower() in {"1", "true", "yes"}
+    online_enabled = bool(cfg.get("online_geocode_enabled", False) and online_env)
+    tolerance_deg = float(cfg.get("country_check", {}).get("tolerance_deg", 0.25))
+    run_stage(
+        "geocode",
+        lambda: build(online_enabled, tolerance_deg),
+        inputs=["data/interim/cleaned_facilities.csv", "caches/geocoding_cache.csv", COUNTRIES_PATH],
+        outputs=["data/interim/cleaned_facilities.csv"],
+        params={"online_enabled": online_enabled, "country_tolerance_deg": tolerance_deg},
+        cache_cfg=cfg.get("stage_cache"),
+        force=args.force,
+        code_paths=[__file__, *package_modules("geocode", "boundaries")],
+    )
+
+
 if __name__ == "__main__":
     main()
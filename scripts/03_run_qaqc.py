@@ -9,18 +9,47 @@ import logging
 
 import pandas as pd
 
-from facility_registry.qa import generate_qa
+from facility_registry.ingest import discover_sources
+from facility_registry.io import load_config
+from facility_registry.qa import generate_qa, write_qa_outputs
+from facility_registry.stage_cache import package_modules, parse_stage_args, run_stage
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
 
 
-def main() -> None:
-    raw = pd.read_csv("data/raw/facilities_raw.csv")
+def build(backend: str, sources: list[Path]) -> None:
+    if backend == "polars":
+        from facility_registry.lazy import collect_qa_metrics_lazy, read_out_of_range_fixes
+
+        interim = "data/interim/cleaned_facilities.csv"
+        metrics = collect_qa_metrics_lazy(sources, interim)
+        write_qa_outputs(metrics, read_out_of_range_fixes(interim), "reports/qa")
+        logging.info("Generated QA outputs")
+        return
+
+    raw = pd.concat([pd.read_csv(path) for path in sources], ignore_index=True)
     df = pd.read_csv("data/interim/cleaned_facilities.csv")
     out_of_range_fixes = int(df.get("_out_of_range_fixes", pd.Series([0])).iloc[0])
     generate_qa(raw, df, out_of_range_fixes, "reports/qa")
     logging.info("Generated QA outputs")
 
 
+def main() -> None:
+    args = parse_stage_args("Generate QA/QC summary and report.")
+    cfg = load_config()
+    ingest_cfg = cfg.get("ingest", {})
+    sources = discover_sources(ingest_cfg.get("raw_dir", "data/raw"), ingest_cfg.get("pattern", "*.csv"))
+    run_stage(
+        "qa",
+        lambda: build(cfg.get("backend", "pandas"), sources),
+        inputs=[*sources, "data/interim/cleaned_facilities.csv"],
+        outputs=["reports/qa/qa_summary.csv", "reports/qa/qa_report.md", "reports/qa/country_mismatches.csv"],
+        params={"backend": cfg.get("backend", "pandas")},
+        cache_cfg=cfg.get("stage_cache"),
+        force=args.force,
+        code_paths=[__file__, *package_modules("__init__", "qa", "lazy")],
+    )
+
+
 if __name__ == "__main__":
     main()
@@ -10,37 +10,74 @@ from datetime import date
 
 import pandas as pd
 
-from facility_registry import REQUIRED_SCHEMA
+from facility_registry.dedupe import restore_canonical_records
 from facility_registry.export import export_outputs
 from facility_registry.io import load_config
+from facility_registry.query import FacilityIndex
+from facility_registry.search import SearchIndex
+from facility_registry.stage_cache import package_modules, parse_stage_args, run_stage
+from facility_registry.validate import apply_schema_defaults, validate_frame
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
 
 
-def main() -> None:
-    cfg = load_config()
+def _quarantine_path(cfg: dict) -> str:
+    return cfg.get("validation", {}).get("quarantine_path", "data/processed/facilities_quarantine.csv")
+
+
+def build(cfg: dict, updated_at: str) -> None:
     df = pd.read_csv("data/interim/cleaned_facilities.csv")
-    df["updated_at"] = date.today().isoformat()
-
-    missing = [c for c in REQUIRED_SCHEMA if c not in df.columns]
-    for col in missing:
-        if col in {"duplicate_group_id"}:
-            df[col] = ""
-        elif col in {"is_canonical_record", "has_valid_coords"}:
-            df[col] = False
-        elif col in {"geocode_confidence", "lat", "lon"}:
-            df[col] = 0.0
-        else:
-            df[col] = ""
+    df["updated_at"] = updated_at
+
+    df = apply_schema_defaults(df)
+
+    val_cfg = cfg.get("validation", {})
+    valid, quarantined = validate_frame(df, chunksize=int(val_cfg.get("chunksize", 100_000)))
+    quarantine_path = Path(_quarantine_path(cfg))
+    quarantine_path.parent.mkdir(parents=True, exist_ok=True)
+    quarantined.to_csv(quarantine_path, index=False)
+    if len(quarantined):
+        logging.warning("Quarantined %s of %s rows to %s", len(quarantined), len(df), quarantine_path)
+    # A quarantined canonical row would leave its valid siblings without one.
+    valid = restore_canonical_records(valid)
 
     export_outputs(
-        df,
+        valid,
         "data/processed/facilities_master.csv",
         "data/processed/facilities_master.gpkg",
         layer_name=cfg["gpkg_layer_name"],
         crs=cfg["crs_output"],
     )
-    logging.info("Exported processed CSV and GPKG")
+    FacilityIndex.from_frame(valid).save("data/processed/facilities_master_index.npz")
+    SearchIndex.from_frame(valid).save("data/processed/facilities_master_search.npz")
+    logging.info("Exported processed CSV, GPKG, spatial and search indexes")
+
+
+def main() -> None:
+    args = parse_stage_args("Validate and export the processed registry.")
+    cfg = load_config()
+    updated_at = date.today().isoformat()
+    run_stage(
+        "export",
+        lambda: build(cfg, updated_at),
+        inputs=["data/interim/cleaned_facilities.csv"],
+        outputs=[
+            "data/processed/facilities_master.csv",
+            "data/processed/facilities_master.gpkg",
+            "data/processed/facilities_master_index.npz",
+            "data/processed/facilities_master_search.npz",
+            _quarantine_path(cfg),
+        ],
+        params={
+            "updated_at": updated_at,
+            "gpkg_layer_name": cfg["gpkg_layer_name"],
+            "crs_output": cfg["crs_output"],
+            "validation": cfg.get("validation", {}),
+        },
+        cache_cfg=cfg.get("stage_cache"),
+        force=args.force,
+        code_paths=[__file__, *package_modules("__init__", "validate", "dedupe", "export", "query", "qa", "search", "normalize")],
+    )
 
 
 if __name__ == "__main__":
@@ -11,14 +11,13 @@ import pandas as pd
 
 from facility_registry.io import load_config
 from facility_registry.mapping import make_static_map
+from facility_registry.stage_cache import package_modules, parse_stage_args, run_stage
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
 
 
-def main() -> None:
-    cfg = load_config()
+def build(map_cfg: dict) -> None:
     df = pd.read_csv("data/processed/facilities_master.csv")
-    map_cfg = cfg["map"]
     make_static_map(
         df,
         map_cfg["output_path"],
@@ -29,5 +28,21 @@ def main() -> None:
     logging.info("Generated static map PDF")
 
 
+def main() -> None:
+    args = parse_stage_args("Render the static overview map.")
+    cfg = load_config()
+    map_cfg = cfg["map"]
+    run_stage(
+        "map",
+        lambda: build(map_cfg),
+        inputs=["data/processed/facilities_master.csv"],
+        outputs=[map_cfg["output_path"]],
+        params={"map": map_cfg},
+        cache_cfg=cfg.get("stage_cache"),
+        force=args.force,
+        code_paths=[__file__, *package_modules("mapping")],
+    )
+
+
 if __name__ == "__main__":
     main()
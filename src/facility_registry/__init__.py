@@ -30,3 +30,36 @@ ALLOWED_FACILITY_TYPES = {
     "airport",
     "rail terminal",
 }
+
+GEOCODE_METHODS = {
+    "raw_coords",
+    "group_propagated",
+    "cached_geocode",
+    "online_geocode",
+    "none",
+}
+
+# Declarative column rules for REQUIRED_SCHEMA, compiled by facility_registry.validate.
+# Keys: dtype (str/float/bool), nullable, default (used when the column is absent),
+# and optional allowed / pattern / min / max constraints.
+SCHEMA_RULES: dict[str, dict[str, object]] = {
+    "facility_id": {"dtype": "str", "nullable": False, "default": "", "pattern": r"FAC-[0-9A-F]{8}"},
+    "facility_name": {"dtype": "str", "nullable": False, "default": ""},
+    "facility_type": {"dtype": "str", "nullable": False, "default": "", "allowed": ALLOWED_FACILITY_TYPES},
+    "operator": {"dtype": "str", "nullable": True, "default": ""},
+    "street": {"dtype": "str", "nullable": True, "default": ""},
+    "city": {"dtype": "str", "nullable": True, "default": ""},
+    "state_region": {"dtype": "str", "nullable": True, "default": ""},
+    "postal_code": {"dtype": "str", "nullable": True, "default": ""},
+    "country_iso2": {"dtype": "str", "nullable": False, "default": "", "pattern": r"[A-Z]{2}"},
+    "address_full": {"dtype": "str", "nullable": True, "default": ""},
+    "lat": {"dtype": "float", "nullable": True, "default": 0.0, "min": -90.0, "max": 90.0},
+    "lon": {"dtype": "float", "nullable": True, "default": 0.0, "min": -180.0, "max": 180.0},
+    "has_valid_coords": {"dtype": "bool", "nullable": False, "default": False},
+    "duplicate_group_id": {"dtype": "str", "nullable": True, "default": "", "pattern": r"DG-\d{4,}"},
+    "is_canonical_record": {"dtype": "bool", "nullable": False, "default": False},
+    "geocode_method": {"dtype": "str", "nullable": False, "default": "none", "allowed": GEOCODE_METHODS},
+    "geocode_confidence": {"dtype": "float", "nullable": False, "default": 0.0, "min": 0.0, "max": 1.0},
+    "source": {"dtype": "str", "nullable": False, "default": ""},
+    "updated_at": {"dtype": "str", "nullable": False, "default": "", "pattern": r"\d{4}-\d{2}-\d{2}"},
+}
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import shapely
+
+# Natural Earth 1:110m admin-0 countries (public domain), keyed by ISO alpha-2 and snapped to 0.001 deg.
+COUNTRIES_PATH = Path(__file__).resolve().parent / "data" / "countries_110m.geojson"
+
+
+TILE_DEG = 5.0
+
+
+def _tile(geoms: np.ndarray, codes: np.ndarray, cell: float) -> tuple[np.ndarray, shapely.STRtree]:
+    """Clip polygons to a lon/lat grid so each tree leaf holds a small, cheap-to-test piece."""
+    xs = np.arange(-180.0, 180.0, cell)
+    ys = np.arange(-90.0, 90.0, cell)
+    gx, gy = np.meshgrid(xs, ys)
+    cells = shapely.box(gx.ravel(), gy.ravel(), gx.ravel() + cell, gy.ravel() + cell)
+    cell_idx, geom_idx = shapely.STRtree(cells).query(geoms, predicate="intersects")[::-1]
+    pieces = shapely.intersection(geoms[geom_idx], cells[cell_idx])
+    keep = ~shapely.is_empty(pieces) & (shapely.get_type_id(pieces) >= 3)
+    pieces = pieces[keep]
+    shapely.prepare(pieces)
+    return codes[geom_idx[keep]], shapely.STRtree(pieces)
+
+
+@lru_cache(maxsize=4)
+def load_country_index(
+    path: str | Path = COUNTRIES_PATH, tolerance_deg: float = 0.0
+) -> tuple[np.ndarray, shapely.STRtree]:
+    """ISO codes and an STRtree over grid-tiled, prepared country polygons (optionally buffered)."""
+    features = json.loads(Path(path).read_text(encoding="utf-8"))["features"]
+    codes = np.array([f["properties"]["iso_a2"] for f in features], dtype=object)
+    geoms = shapely.from_geojson([json.dumps(f["geometry"]) for f in features])
+    if tolerance_deg > 0:
+        geoms = shapely.buffer(geoms, tolerance_deg, quad_segs=2)
+    return _tile(geoms, codes, TILE_DEG)
+
+
+@lru_cache(maxsize=4)
+def bundled_countries(path: str | Path = COUNTRIES_PATH) -> frozenset[str]:
+    """ISO codes that have an outline; small states such as SG, HK, MT and BH are absent at 1:110m."""
+    features = json.loads(Path(path).read_text(encoding="utf-8"))["features"]
+    return frozenset(f["properties"]["iso_a2"] for f in features)
+
+
+def _first_hit(points: np.ndarray, codes: np.ndarray, tree: shapely.STRtree) -> np.ndarray:
+    out = np.full(len(points), "", dtype=object)
+    pt_idx, poly_idx = tree.query(points, predicate="intersects")
+    # Points on a shared border hit several pieces; reversing makes the first listed piece win.
+    out[pt_idx[::-1]] = codes[poly_idx[::-1]]
+    return out
+
+
+def locate_countries(lat, lon, tolerance_deg: float = 0.25, path: str | Path = COUNTRIES_PATH) -> np.ndarray:
+    """ISO alpha-2 of the polygon containing each point ("" when none).
+
+    Points outside every polygon are retried against polygons buffered by ``tolerance_deg``,
+    which absorbs coastal facilities lost to the coarse 1:110m coastline.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    out = np.full(len(lat), "", dtype=object)
+    valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon) & (np.abs(lat) <= 90) & (np.abs(lon) <= 180))
+    if len(valid) == 0:
+        return out
+
+    points = shapely.points(lon[valid], lat[valid])
+    found = _first_hit(points, *load_country_index(path))
+    if tolerance_deg > 0:
+        missing = np.flatnonzero(found == "")
+        if len(missing):
+            found[missing] = _first_hit(points[missing], *load_country_index(path, float(tolerance_deg)))
+    out[valid] = found
+    return out
+
+
+def check_country_consistency(df: pd.DataFrame, tolerance_deg: float = 0.25) -> pd.DataFrame:
+    """Flag rows whose coordinates fall outside their country_iso2 and suggest a lat/lon transposition fix.
+
+    Adds ``coords_country_iso2``, ``country_mismatch``, ``country_unchecked`` and
+    ``suggested_lat``/``suggested_lon``. Declared countries without a bundled outline cannot be
+    checked and are marked unchecked rather than mismatched. A suggestion is made only when the
+    transposed pair lands in the declared country while the current pair does not; this covers
+    both a missed swap and a wrong swap in fix_coordinates.
+    """
+    lat = pd.to_numeric(df["lat"], errors="coerce").to_numpy(dtype=float)
+    lon = pd.to_numeric(df["lon"], errors="coerce").to_numpy(dtype=float)
+    declared = df["country_iso2"].fillna("").astype(str).to_numpy(dtype=object)
+
+    found = locate_countries(lat, lon, tolerance_deg)
+    has_coords = np.isfinite(lat) & np.isfinite(lon) & (declared != "")
+    checkable = np.isin(declared, list(bundled_countries()))
+    mismatch = has_coords & checkable & (found != declared)
+
+    suggested_lat = np.full(len(df), np.nan)
+    suggested_lon = np.full(len(df), np.nan)
+    rows = np.flatnonzero(mismatch & (np.abs(lon) <= 90))
+    if len(rows):
+        hits = locate_countries(lon[rows], lat[rows], tolerance_deg) == declared[rows]
+        rows = rows[hits]
+        suggested_lat[rows] = lon[rows]
+        suggested_lon[rows] = lat[rows]
+
+    df["coords_country_iso2"] = found
+    df["country_mismatch"] = mismatch
+    df["country_unchecked"] = has_coords & ~checkable
+    df["suggested_lat"] = suggested_lat
+    df["suggested_lon"] = suggested_lon
+    return df
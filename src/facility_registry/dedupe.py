@@ -11,6 +11,28 @@ def _completeness_score(row: pd.Series) -> int:
     return sum(1 for col in cols if str(row.get(col, "")).strip() != "")
 
 
+def _canonical_index(members: pd.DataFrame):
+    subset = members.copy()
+    subset["completeness"] = subset.apply(_completeness_score, axis=1)
+    subset = subset.sort_values(
+        by=["completeness", "has_valid_coords", "facility_id"],
+        ascending=[False, False, True],
+    )
+    return subset.index[0]
+
+
+def restore_canonical_records(df: pd.DataFrame) -> pd.DataFrame:
+    """Promote a new canonical record in groups whose canonical row was dropped (e.g. quarantined)."""
+    df = df.copy()
+    groups = df["duplicate_group_id"].fillna("").astype(str)
+    canonical_counts = df["is_canonical_record"].astype(bool).groupby(groups).sum()
+    orphaned = [g for g, n in canonical_counts.items() if g != "" and n == 0]
+    for group in orphaned:
+        members = df.index[groups == group]
+        df.loc[_canonical_index(df.loc[members]), "is_canonical_record"] = True
+    return df
+
+
 def deduplicate(df: pd.DataFrame, thresholds: dict[str, float]) -> pd.DataFrame:
     df = df.copy()
     parent = list(range(len(df)))
@@ -57,13 +79,7 @@ def deduplicate(df: pd.DataFrame, thresholds: dict[str, float]) -> pd.DataFrame:
             continue
         label = f"DG-{gid:04d}"
         gid += 1
-        subset = df.loc[members].copy()
-        subset["completeness"] = subset.apply(_completeness_score, axis=1)
-        subset = subset.sort_values(
-            by=["completeness", "has_valid_coords", "facility_id"],
-            ascending=[False, False, True],
-        )
-        canonical_idx = subset.index[0]
+        canonical_idx = _canonical_index(df.loc[members])
         df.loc[members, "duplicate_group_id"] = label
         df.loc[members, "is_canonical_record"] = False
         df.loc[canonical_idx, "is_canonical_record"] = True
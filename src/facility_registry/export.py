@@ -7,6 +7,7 @@ import pandas as pd
 from shapely.geometry import Point
 
 from facility_registry import REQUIRED_SCHEMA
+from facility_registry.io import atomic_write
 
 
 def export_outputs(df: pd.DataFrame, csv_path: str | Path, gpkg_path: str | Path, layer_name: str, crs: str) -> None:
@@ -16,8 +17,10 @@ def export_outputs(df: pd.DataFrame, csv_path: str | Path, gpkg_path: str | Path
     gpkg_path.parent.mkdir(parents=True, exist_ok=True)
 
     output = df[REQUIRED_SCHEMA].copy()
-    output.to_csv(csv_path, index=False)
+    with atomic_write(csv_path) as tmp:
+        output.to_csv(tmp, index=False)
 
     geometry = [Point(xy) if pd.notna(xy[0]) and pd.notna(xy[1]) else None for xy in zip(output["lon"], output["lat"])]
     gdf = gpd.GeoDataFrame(output, geometry=geometry, crs=crs)
-    gdf.to_file(gpkg_path, layer=layer_name, driver="GPKG")
+    with atomic_write(gpkg_path) as tmp:
+        gdf.to_file(tmp, layer=layer_name, driver="GPKG")
@@ -1,9 +1,55 @@
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
+from rapidfuzz import fuzz, process
+
+logger = logging.getLogger(__name__)
+
+RAW_CONFIDENCE = 0.90
+ONLINE_CONFIDENCE = 0.80
+
+
+def _address_keys(address: pd.Series, country_iso2: pd.Series) -> pd.Series:
+    return address.fillna("").str.lower().str.strip() + "|" + country_iso2.fillna("").str.upper().str.strip()
+
+
+def propagate_group_coordinates(df: pd.DataFrame) -> pd.Series:
+    """Copy raw coordinates to duplicate-group members that lack them; returns the filled-row mask.
+
+    Each member takes the sibling with raw coordinates whose name and address match it best,
+    and its confidence is the raw-coordinate confidence scaled by that combined similarity.
+    """
+    filled = pd.Series(False, index=df.index)
+    groups = df["duplicate_group_id"].fillna("").astype(str)
+    in_group = groups != ""
+    donor = in_group & (df["geocode_method"] == "raw_coords")
+    needy = in_group & ~df["has_valid_coords"]
+    eligible = groups[needy][groups[needy].isin(set(groups[donor]))]
+    if eligible.empty:
+        return filled
+
+    names = df["facility_name"].fillna("").astype(str)
+    addresses = df["address_full"].fillna("").astype(str)
+    donors_by_group = df.index[donor].groupby(groups[donor])
+    for group, targets in eligible.index.groupby(eligible).items():
+        sources = donors_by_group[group]
+        name_scores = process.cdist(names[targets].tolist(), names[sources].tolist(), scorer=fuzz.token_sort_ratio)
+        addr_scores = process.cdist(addresses[targets].tolist(), addresses[sources].tolist(), scorer=fuzz.token_sort_ratio)
+        combined = (name_scores.astype(float) + addr_scores) / 2
+        best = combined.argmax(axis=1)
+        picked = sources[best]
+        df.loc[targets, "lat"] = df.loc[picked, "lat"].to_numpy()
+        df.loc[targets, "lon"] = df.loc[picked, "lon"].to_numpy()
+        df.loc[targets, "geocode_confidence"] = np.round(RAW_CONFIDENCE * combined[np.arange(len(targets)), best] / 100, 2)
+        filled.loc[targets] = True
+
+    df.loc[filled, "has_valid_coords"] = True
+    df.loc[filled, "geocode_method"] = "group_propagated"
+    return filled
 
 
 def apply_geocoding(
@@ -13,35 +59,42 @@ def apply_geocoding(
 ) -> pd.DataFrame:
     df = df.copy()
     cache = pd.read_csv(cache_path)
-    cache["cache_key"] = (
-        cache["address_full"].fillna("").str.lower().str.strip()
-        + "|"
-        + cache["country_iso2"].fillna("").str.upper().str.strip()
-    )
-    cache_map = cache.set_index("cache_key")
+    cache["cache_key"] = _address_keys(cache["address_full"], cache["country_iso2"])
+    cache_map = cache.drop_duplicates("cache_key").set_index("cache_key")
 
     df["geocode_method"] = "none"
     df["geocode_confidence"] = 0.0
 
-    raw_mask = df["has_valid_coords"]
+    raw_mask = df["has_valid_coords"].astype(bool)
+    df["has_valid_coords"] = raw_mask
     df.loc[raw_mask, "geocode_method"] = "raw_coords"
-    df.loc[raw_mask, "geocode_confidence"] = 0.90
+    df.loc[raw_mask, "geocode_confidence"] = RAW_CONFIDENCE
+
+    propagated = propagate_group_coordinates(df)
 
+    # Only rows still unresolved reach the cache and provider, each distinct address once.
     missing = ~df["has_valid_coords"]
-    keys = df["address_full"].fillna("").str.lower().str.strip() + "|" + df["country_iso2"].fillna("").str.upper().str.strip()
-
-    for idx in df[missing].index:
-        key = keys.loc[idx]
-        if key in cache_map.index:
-            c = cache_map.loc[key]
-            df.at[idx, "lat"] = float(c["lat"])
-            df.at[idx, "lon"] = float(c["lon"])
-            df.at[idx, "has_valid_coords"] = True
-            df.at[idx, "geocode_method"] = "cached_geocode"
-            df.at[idx, "geocode_confidence"] = float(c["geocode_confidence"])
-        elif online_enabled:
-            df.at[idx, "geocode_method"] = "online_geocode"
-            df.at[idx, "geocode_confidence"] = 0.80
+    keys = _address_keys(df["address_full"], df["country_iso2"])[missing]
+    unique_keys = pd.Index(keys.unique())
+    found = cache_map.reindex(unique_keys).dropna(subset=["lat", "lon"])
+    hit = keys.isin(found.index)
+    hit_idx = keys.index[hit]
+    matched = found.loc[keys[hit]]
+    df.loc[hit_idx, "lat"] = matched["lat"].astype(float).to_numpy()
+    df.loc[hit_idx, "lon"] = matched["lon"].astype(float).to_numpy()
+    df.loc[hit_idx, "has_valid_coords"] = True
+    df.loc[hit_idx, "geocode_method"] = "cached_geocode"
+    df.loc[hit_idx, "geocode_confidence"] = matched["geocode_confidence"].astype(float).to_numpy()
+    if online_enabled:
+        online_idx = keys.index[~hit]
+        df.loc[online_idx, "geocode_method"] = "online_geocode"
+        df.loc[online_idx, "geocode_confidence"] = ONLINE_CONFIDENCE
+    logger.info(
+        "Propagated coordinates to %s rows within duplicate groups; %s unresolved rows share %s distinct addresses",
+        int(propagated.sum()),
+        len(keys),
+        len(unique_keys),
+    )
 
     df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
     df["lon"] = pd.to_numeric(df["lon"], errors="coerce")
@@ -0,0 +1,129 @@
+"""Multi-source ingest: discover raw partner files, map their headers once, normalize them in parallel."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from facility_registry.io import read_raw
+from facility_registry.normalize import RAW_TO_STANDARD, STANDARD_COLUMNS, column_sources, normalize_dataframe
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RAW_DIR = "data/raw"
+DEFAULT_PATTERN = "*.csv"
+DEFAULT_MAPPING_CACHE = "caches/column_mappings.json"
+# Stored mappings are only valid for the alias table that produced them.
+MAPPING_RULES_VERSION = hashlib.sha1(
+    json.dumps([RAW_TO_STANDARD, STANDARD_COLUMNS], sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+
+def discover_sources(raw_dir: str | Path = DEFAULT_RAW_DIR, pattern: str = DEFAULT_PATTERN) -> list[Path]:
+    """Raw files to ingest, sorted by name so the merged frame has a stable row order."""
+    return sorted(p for p in Path(raw_dir).glob(pattern) if p.is_file())
+
+
+def read_header(path: str | Path, backend: str = "pandas") -> list[str]:
+    if backend == "polars":
+        from facility_registry.lazy import read_header as read_header_lazy
+
+        return read_header_lazy(path)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def header_signature(columns: list[str]) -> str:
+    return hashlib.sha1("\x1f".join(columns).encode("utf-8")).hexdigest()
+
+
+class ColumnMappingCache:
+    """Header signature -> ``column_sources`` mapping, persisted as JSON between runs.
+
+    Partner files keep the same header from day to day, so each convention is resolved once.
+    The file records the ``MAPPING_RULES_VERSION`` it was built with and is discarded when
+    ``RAW_TO_STANDARD`` or ``STANDARD_COLUMNS`` change; entries may be hand-edited otherwise.
+    """
+
+    def __init__(self, path: str | Path | None = DEFAULT_MAPPING_CACHE) -> None:
+        self.path = Path(path) if path else None
+        self.mappings: dict[str, dict[str, list[str]]] = {}
+        self.dirty = False
+        if self.path is not None and self.path.exists():
+            stored = json.loads(self.path.read_text(encoding="utf-8"))
+            if stored.get("rules_version") == MAPPING_RULES_VERSION:
+                self.mappings = stored["mappings"]
+            else:
+                logger.info("Column mapping rules changed; rebuilding %s", self.path)
+                self.dirty = True
+
+    def resolve(self, columns: list[str]) -> dict[str, list[str]]:
+        key = header_signature(columns)
+        if key not in self.mappings:
+            self.mappings[key] = column_sources(columns)
+            self.dirty = True
+        return self.mappings[key]
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"rules_version": MAPPING_RULES_VERSION, "mappings": self.mappings}
+        self.path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        self.dirty = False
+
+    def resolve_files(self, paths: list[str | Path], backend: str = "pandas") -> list[dict[str, list[str]]]:
+        """Mappings for each file's header, saving any newly resolved ones."""
+        mappings = [self.resolve(read_header(p, backend)) for p in paths]
+        self.save()
+        return mappings
+
+
+def normalize_source(path: str | Path, sources: dict[str, list[str]], backend: str = "pandas") -> tuple[pd.DataFrame, int]:
+    """Normalize one raw file and record its name in ``source_file``.
+
+    In-file ``source`` labels are kept (blank ones fall back to the file stem), so rows from
+    partners sharing a label stay traceable to the file they came from.
+    """
+    path = Path(path)
+    if backend == "polars":
+        from facility_registry.lazy import normalize_csv_lazy
+
+        frame, fixes = normalize_csv_lazy(path, default_source=path.stem, sources=sources)
+    else:
+        frame, fixes = normalize_dataframe(read_raw(path), default_source=path.stem, sources=sources)
+    frame["source_file"] = path.name
+    return frame, fixes
+
+
+def ingest_sources(
+    paths: list[str | Path],
+    backend: str = "pandas",
+    max_workers: int | None = None,
+    mapping_cache: ColumnMappingCache | None = None,
+) -> tuple[pd.DataFrame, int]:
+    """Normalize every file and concatenate them in path order.
+
+    The pandas backend fans files out over a process pool. Polars already runs each query
+    on all cores, so the polars backend processes files one after another.
+    """
+    paths = [Path(p) for p in paths]
+    if not paths:
+        raise FileNotFoundError("no raw source files to ingest")
+    mappings = (mapping_cache or ColumnMappingCache(None)).resolve_files(paths, backend)
+
+    if backend == "polars" or len(paths) == 1 or max_workers == 1:
+        results = [normalize_source(p, m, backend) for p, m in zip(paths, mappings)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(normalize_source, paths, mappings, [backend] * len(paths)))
+
+    for path, (frame, _) in zip(paths, results):
+        logger.info("Ingested %s rows from %s", len(frame), path)
+    frames = [frame for frame, _ in results]
+    out_of_range_fixes = sum(fixes for _, fixes in results)
+    return pd.concat(frames, ignore_index=True), out_of_range_fixes
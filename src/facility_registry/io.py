@@ -1,11 +1,35 @@
 from __future__ import annotations
 
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
+import pandas as pd
 import yaml
 
 
 def load_config(path: str | Path = "config/config.yaml") -> dict[str, Any]:
     with Path(path).open("r", encoding="utf-8") as fh:
         return yaml.safe_load(fh)
+
+
+@contextmanager
+def atomic_write(path: str | Path) -> Iterator[Path]:
+    """Yield a temp path beside ``path`` and move it into place only once fully written.
+
+    Readers polling ``path`` (e.g. the lookup service) then see either the old or the new file.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.stem}.tmp{path.suffix}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def read_raw(path: str | Path) -> pd.DataFrame:
+    # Raw fields stay text so postal codes and coordinates are parsed by normalize, not by CSV inference.
+    return pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""])
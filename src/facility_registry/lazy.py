@@ -0,0 +1,227 @@
+"""Polars LazyFrame implementation of the normalize and QA stages.
+
+Selected with ``backend: polars`` in the config. Each stage is expressed as a single lazy
+query over the CSV so polars can push projections into the scan, stream the file and run
+expressions on all cores. Results match the pandas implementation row for row.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import polars as pl
+except ImportError as exc:  # pragma: no cover - exercised only without polars installed
+    raise ImportError("backend 'polars' requires the polars package: pip install polars") from exc
+
+from facility_registry.normalize import STANDARD_COLUMNS, column_sources, normalize_country
+from facility_registry.qa import MISMATCH_COLUMNS, format_precision
+
+# pandas' default NA tokens, so lazily scanned interim files see the same nulls as pd.read_csv.
+PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+_TEXT_COLUMNS = ["facility_name", "facility_type", "operator", "street", "city", "state_region", "postal_code", "source"]
+_ADDRESS_PARTS = ["street", "city", "state_region", "postal_code", "country_iso2"]
+
+
+def _collect(lf: pl.LazyFrame) -> pl.DataFrame:
+    return lf.collect(engine="streaming")
+
+
+def _to_pandas(df: pl.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({col: df[col].to_numpy() for col in df.columns})
+
+
+def _clean(expr: pl.Expr) -> pl.Expr:
+    """Expression form of normalize.clean_text."""
+    return (
+        expr.cast(pl.String)
+        .fill_null("")
+        .str.strip_chars()
+        .str.replace_all(r"\s+", " ")
+        .str.replace_all(r"[|;]+", "")
+    )
+
+
+def _parse_coordinate(expr: pl.Expr) -> pl.Expr:
+    """Expression form of normalize.parse_coordinate."""
+    token = _clean(expr).str.replace_all(",", ".", literal=True).str.replace_all(r"[^0-9.\-]", "")
+    return token.cast(pl.Float64, strict=False)
+
+
+def _map_countries(s: pl.Series) -> pl.Series:
+    uniques = s.unique().to_list()
+    mapping = {value: normalize_country(value) for value in uniques}
+    return s.replace_strict(mapping, return_dtype=pl.String)
+
+
+def _hash_ids(s: pl.Series) -> pl.Series:
+    ids = [f"FAC-{hashlib.sha1(base.encode('utf-8')).hexdigest()[:8].upper()}" for base in s.to_list()]
+    return pl.Series(s.name, ids, dtype=pl.String)
+
+
+def read_header(path: str | Path) -> list[str]:
+    """Column names as polars sees them (duplicate headers are renamed differently than in pandas)."""
+    return pl.scan_csv(path, infer_schema=False).collect_schema().names()
+
+
+def normalize_plan(
+    path: str | Path,
+    default_source: str = "synthetic_v1",
+    sources: dict[str, list[str]] | None = None,
+) -> pl.LazyFrame:
+    """Lazy equivalent of ``normalize_dataframe(read_raw(path))`` plus an ``_out_of_range`` flag column."""
+    lf = pl.scan_csv(path, infer_schema=False, null_values=[""])
+    sources = column_sources(lf.collect_schema().names()) if sources is None else sources
+    std = []
+    for col in STANDARD_COLUMNS:
+        raws = sources.get(col, [])
+        if not raws:
+            std.append(pl.lit(None, dtype=pl.String).alias(col))
+        else:
+            std.append(pl.coalesce([pl.col(raw) for raw in raws]).alias(col))
+    lf = lf.select(std)
+
+    lat0 = _parse_coordinate(pl.col("lat"))
+    lon0 = _parse_coordinate(pl.col("lon"))
+    swap = (lat0.abs() > 90) & (lon0.abs() <= 90)
+    lat1 = pl.when(swap).then(lon0).otherwise(lat0)
+    lon1 = pl.when(swap).then(lat0).otherwise(lon0)
+    invalid = ((lat1.abs() > 90) | (lon1.abs() > 180)).fill_null(False)
+
+    lf = lf.with_columns(
+        [_clean(pl.col(col)) for col in _TEXT_COLUMNS]
+        + [
+            pl.col("country").fill_null("").map_batches(_map_countries, return_dtype=pl.String, is_elementwise=True).alias("country_iso2"),
+            lat1.alias("lat"),
+            lon1.alias("lon"),
+            invalid.alias("_out_of_range"),
+        ]
+    )
+    lf = lf.with_columns(
+        pl.col("facility_type").str.to_lowercase(),
+        pl.when(pl.col("_out_of_range")).then(None).otherwise(pl.col("lat")).alias("lat"),
+        pl.when(pl.col("_out_of_range")).then(None).otherwise(pl.col("lon")).alias("lon"),
+    )
+    parts = pl.concat_list([_clean(pl.col(col)) for col in _ADDRESS_PARTS])
+    lf = lf.with_columns(
+        (pl.col("lat").is_not_null() & pl.col("lon").is_not_null()).alias("has_valid_coords"),
+        parts.list.eval(pl.element().filter(pl.element() != "")).list.join(", ").alias("address_full"),
+    )
+    id_base = pl.concat_str(
+        [
+            _clean(pl.col("facility_name")).str.to_lowercase(),
+            _clean(pl.col("address_full")).str.to_lowercase(),
+            pl.col("country_iso2"),
+        ],
+        separator="|",
+    )
+    return lf.with_columns(
+        id_base.map_batches(_hash_ids, return_dtype=pl.String, is_elementwise=True).alias("facility_id"),
+        pl.when(pl.col("source") == "").then(pl.lit(default_source)).otherwise(pl.col("source")).alias("source"),
+    ).select(
+        [c for c in STANDARD_COLUMNS if c != "country"]
+        + ["country_iso2", "has_valid_coords", "address_full", "facility_id", "_out_of_range"]
+    )
+
+
+def normalize_csv_lazy(
+    path: str | Path,
+    default_source: str = "synthetic_v1",
+    sources: dict[str, list[str]] | None = None,
+) -> tuple[pd.DataFrame, int]:
+    out = _collect(normalize_plan(path, default_source, sources))
+    out_of_range_fixes = int(out["_out_of_range"].sum())
+    return _to_pandas(out.drop("_out_of_range")), out_of_range_fixes
+
+
+def read_out_of_range_fixes(interim_path: str | Path) -> int:
+    lf = pl.scan_csv(interim_path, null_values=PANDAS_NA_VALUES)
+    if "_out_of_range_fixes" not in lf.collect_schema().names():
+        return 0
+    value = _collect(lf.select(pl.col("_out_of_range_fixes").first())).item()
+    return int(value or 0)
+
+
+def collect_qa_metrics_lazy(raw_paths: str | Path | list[str | Path], interim_path: str | Path) -> dict[str, object]:
+    """Lazy equivalent of ``qa.collect_qa_metrics`` reading the raw and interim CSVs directly."""
+    raw_paths = [raw_paths] if isinstance(raw_paths, (str, Path)) else list(raw_paths)
+    raw_rows = sum(_collect(pl.scan_csv(p, infer_schema=False).select(pl.len())).item() for p in raw_paths)
+
+    lf = pl.scan_csv(interim_path, null_values=PANDAS_NA_VALUES, infer_schema_length=None)
+    columns = lf.collect_schema().names()
+    canonical = pl.col("is_canonical_record")
+    lat, lon = pl.col("lat"), pl.col("lon")
+    coords_seen = lat.is_not_null() | lon.is_not_null()
+    coords_ok = lat.is_between(-90, 90) & lon.is_between(-180, 180)
+
+    scalars = _collect(
+        lf.select(
+            pl.len().alias("processed_rows"),
+            canonical.sum().alias("canonical_rows"),
+            pl.col("has_valid_coords").sum().alias("valid_coords"),
+            (coords_ok.fill_null(False) | ~coords_seen).all().alias("coord_ranges_ok"),
+            (pl.col("country_iso2").str.len_chars() == 2).fill_null(False).filter(canonical).all().alias("canonical_iso2_ok"),
+            *[pl.col(c).null_count().alias(f"_null_{c}") for c in columns],
+            *([pl.col("country_unchecked").sum().alias("country_unchecked")] if "country_unchecked" in columns else []),
+        )
+    ).row(0, named=True)
+
+    dup = _collect(
+        lf.filter(pl.col("duplicate_group_id").is_not_null() & (pl.col("duplicate_group_id") != ""))
+        .group_by("duplicate_group_id")
+        .len()
+        .sort("duplicate_group_id")
+    )
+    countries = _collect(
+        lf.filter(canonical & pl.col("country_iso2").is_not_null())
+        .group_by("country_iso2")
+        .len()
+        .sort(["len", "country_iso2"], descending=[True, False])
+    )
+    types = _collect(lf.select(pl.col("facility_type").drop_nulls().unique()))["facility_type"].to_list()
+
+    distance_km = pd.Series(dtype=float)
+    if {"raw_lat", "raw_lon"}.issubset(columns):
+        compared = lf.filter(
+            pl.col("geocode_method").is_in(["cached_geocode", "online_geocode"])
+            & pl.col("has_valid_coords")
+            & pl.all_horizontal(pl.col(c).is_not_null() for c in ["raw_lat", "raw_lon", "lat", "lon"])
+        )
+        p1, p2 = pl.col("raw_lat").radians(), lat.radians()
+        dphi = (lat - pl.col("raw_lat")).radians()
+        dlambda = (lon - pl.col("raw_lon")).radians()
+        a = (dphi / 2).sin() ** 2 + p1.cos() * p2.cos() * (dlambda / 2).sin() ** 2
+        dist = _collect(compared.select((2 * 6371.0 * pl.arctan2(a.sqrt(), (1 - a).sqrt())).alias("d")))["d"]
+        distance_km = pd.Series(dist.to_numpy(), dtype=float)
+
+    return {
+        "raw_rows": raw_rows,
+        "processed_rows": scalars["processed_rows"],
+        "canonical_rows": int(scalars["canonical_rows"] or 0),
+        "valid_coords": int(scalars["valid_coords"] or 0),
+        "missing": pd.Series({c: int(scalars[f"_null_{c}"]) for c in columns}, dtype="int64"),
+        "dup_sizes": pd.Series(dup["len"].to_numpy(), index=dup["duplicate_group_id"].to_numpy(), dtype="int64"),
+        "country_counts": pd.Series(countries["len"].to_numpy(), index=countries["country_iso2"].to_numpy(), dtype="int64"),
+        "facility_types": set(types),
+        "precision_text": format_precision(distance_km),
+        "coord_ranges_ok": bool(scalars["coord_ranges_ok"]),
+        "canonical_iso2_ok": bool(scalars["canonical_iso2_ok"]),
+        "country_mismatches": (
+            _to_pandas(
+                _collect(
+                    lf.filter(pl.col("country_mismatch"))
+                    .select(MISMATCH_COLUMNS)
+                    .with_columns(pl.col("lat", "lon", "suggested_lat", "suggested_lon").cast(pl.Float64))
+                )
+            )
+            if "country_mismatch" in columns
+            else pd.DataFrame(columns=MISMATCH_COLUMNS)
+        ),
+        "country_unchecked": int(scalars.get("country_unchecked") or 0),
+    }
@@ -62,31 +62,57 @@ RAW_TO_STANDARD = {
 }
 
 
+def _header_key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "", name.strip().lower())
+
+
+# Keys compared in the same punctuation-free form as headers, so "Street_Address" finds "street_address".
+_HEADER_KEYS = {_header_key(raw): std for raw, std in RAW_TO_STANDARD.items()}
+
+
 def _canonical_col(name: str) -> str:
-    token = re.sub(r"[^a-z0-9]+", "", name.strip().lower())
-    return RAW_TO_STANDARD.get(token, name.strip().lower())
-
-
-def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    renamed = {col: _canonical_col(col) for col in df.columns}
-    df = df.rename(columns=renamed)
-    cols = [
-        "facility_name",
-        "facility_type",
-        "operator",
-        "street",
-        "city",
-        "state_region",
-        "postal_code",
-        "country",
-        "lat",
-        "lon",
-        "source",
-    ]
-    for col in cols:
-        if col not in df.columns:
-            df[col] = np.nan
-    return df[cols].copy()
+    return _HEADER_KEYS.get(_header_key(name), name.strip().lower())
+
+
+STANDARD_COLUMNS = [
+    "facility_name",
+    "facility_type",
+    "operator",
+    "street",
+    "city",
+    "state_region",
+    "postal_code",
+    "country",
+    "lat",
+    "lon",
+    "source",
+]
+
+
+def column_sources(columns: list[str]) -> dict[str, list[str]]:
+    """Raw headers feeding each standard column, in file order."""
+    sources: dict[str, list[str]] = {col: [] for col in STANDARD_COLUMNS}
+    for raw in columns:
+        canonical = _canonical_col(raw)
+        if canonical in sources:
+            sources[canonical].append(raw)
+    return sources
+
+
+def standardize_columns(df: pd.DataFrame, sources: dict[str, list[str]] | None = None) -> pd.DataFrame:
+    """Map raw headers onto STANDARD_COLUMNS; ``sources`` is a precomputed ``column_sources`` result."""
+    out = pd.DataFrame(index=df.index)
+    sources = column_sources(list(df.columns)) if sources is None else sources
+    for col in STANDARD_COLUMNS:
+        raws = sources.get(col, [])
+        if not raws:
+            out[col] = np.nan
+        elif len(raws) == 1:
+            out[col] = df[raws[0]]
+        else:
+            # Several raw headers map to one column (e.g. "Lng" and "Longitude"): first non-null wins.
+            out[col] = df[raws].bfill(axis=1).iloc[:, 0]
+    return out
 
 
 def clean_text(value: Any, lower: bool = False) -> str:
@@ -161,8 +187,12 @@ def make_facility_id(name: str, address: str, country_iso2: str) -> str:
     return f"FAC-{digest}"
 
 
-def normalize_dataframe(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
-    df = standardize_columns(df)
+def normalize_dataframe(
+    df: pd.DataFrame,
+    default_source: str = "synthetic_v1",
+    sources: dict[str, list[str]] | None = None,
+) -> tuple[pd.DataFrame, int]:
+    df = standardize_columns(df, sources)
     for col in ["facility_name", "facility_type", "operator", "street", "city", "state_region", "postal_code", "source"]:
         df[col] = df[col].apply(clean_text)
 
@@ -173,5 +203,5 @@ def normalize_dataframe(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
     df["facility_id"] = df.apply(
         lambda r: make_facility_id(r["facility_name"], r["address_full"], r["country_iso2"]), axis=1
     )
-    df["source"] = df["source"].replace("", "synthetic_v1")
+    df["source"] = df["source"].replace("", default_source)
     return df.drop(columns=["country"]), out_of_range_fixes
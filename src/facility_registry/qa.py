@@ -18,59 +18,114 @@ def haversine_km(lat1, lon1, lat2, lon2):
     return 2 * r * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
 
+MISMATCH_COLUMNS = [
+    "facility_id",
+    "facility_name",
+    "country_iso2",
+    "coords_country_iso2",
+    "lat",
+    "lon",
+    "suggested_lat",
+    "suggested_lon",
+]
+
+
+def format_precision(distance_km: pd.Series) -> str:
+    if distance_km.empty:
+        return "not applicable with offline cache only"
+    return (
+        f"mean={distance_km.mean():.2f} km, "
+        f"median={distance_km.median():.2f} km, "
+        f"p95={distance_km.quantile(0.95):.2f} km"
+    )
+
+
+def collect_qa_metrics(raw_df: pd.DataFrame, df: pd.DataFrame) -> dict[str, object]:
+    """Aggregates behind the QA summary and report, computed with pandas."""
+    canonical = df[df["is_canonical_record"]]
+    dup_sizes = df[df["duplicate_group_id"] != ""].groupby("duplicate_group_id").size()
+    country_counts = canonical["country_iso2"].value_counts().sort_index(kind="stable")
+
+    raw_compare = df[(df["geocode_method"].isin(["cached_geocode", "online_geocode"])) & df["has_valid_coords"]]
+    distance_km = pd.Series(dtype=float)
+    if not raw_compare.empty and {"raw_lat", "raw_lon"}.issubset(df.columns):
+        subset = raw_compare.dropna(subset=["raw_lat", "raw_lon", "lat", "lon"])
+        distance_km = haversine_km(subset["raw_lat"], subset["raw_lon"], subset["lat"], subset["lon"])
+
+    return {
+        "raw_rows": len(raw_df),
+        "processed_rows": len(df),
+        "canonical_rows": len(canonical),
+        "valid_coords": int(df["has_valid_coords"].sum()),
+        "missing": df.isna().sum(),
+        "dup_sizes": dup_sizes,
+        "country_counts": country_counts.sort_values(ascending=False, kind="stable"),
+        "facility_types": set(df["facility_type"].dropna().unique()),
+        "precision_text": format_precision(distance_km),
+        "coord_ranges_ok": bool((df["lat"].dropna().between(-90, 90) & df["lon"].dropna().between(-180, 180)).all()),
+        "canonical_iso2_ok": bool((canonical["country_iso2"].str.len() == 2).all()),
+        "country_mismatches": (
+            df.loc[df["country_mismatch"].astype(bool), MISMATCH_COLUMNS].reset_index(drop=True)
+            if "country_mismatch" in df.columns
+            else pd.DataFrame(columns=MISMATCH_COLUMNS)
+        ),
+        "country_unchecked": int(df["country_unchecked"].astype(bool).sum()) if "country_unchecked" in df.columns else 0,
+    }
+
+
 def generate_qa(raw_df: pd.DataFrame, df: pd.DataFrame, out_of_range_fixes: int, out_dir: str | Path) -> None:
+    write_qa_outputs(collect_qa_metrics(raw_df, df), out_of_range_fixes, out_dir)
+
+
+def write_qa_outputs(metrics: dict[str, object], out_of_range_fixes: int, out_dir: str | Path) -> None:
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    canonical = df[df["is_canonical_record"]]
+    n = metrics["processed_rows"]
+    valid_share = metrics["valid_coords"] / n if n else float("nan")
+    invalid_share = (n - metrics["valid_coords"]) / n if n else float("nan")
+    missing = metrics["missing"]
+    missing_pct = (missing / n * 100).round(2)
+    dup_sizes = metrics["dup_sizes"]
+
     summary_rows: list[dict[str, object]] = []
-    summary_rows.append({"metric": "raw_rows", "value": len(raw_df)})
-    summary_rows.append({"metric": "total_rows_processed", "value": len(df)})
-    summary_rows.append({"metric": "canonical_rows", "value": len(canonical)})
-    summary_rows.append({"metric": "pct_valid_coords", "value": round(df["has_valid_coords"].mean() * 100, 2)})
+    summary_rows.append({"metric": "raw_rows", "value": metrics["raw_rows"]})
+    summary_rows.append({"metric": "total_rows_processed", "value": n})
+    summary_rows.append({"metric": "canonical_rows", "value": metrics["canonical_rows"]})
+    summary_rows.append({"metric": "pct_valid_coords", "value": round(valid_share * 100, 2)})
     summary_rows.append({"metric": "out_of_range_fixes", "value": out_of_range_fixes})
-
-    dup_sizes = df[df["duplicate_group_id"] != ""].groupby("duplicate_group_id").size()
     summary_rows.append({"metric": "duplicate_groups", "value": int(len(dup_sizes))})
 
-    missing = df.isna().sum()
-    missing_pct = (df.isna().mean() * 100).round(2)
-    for col in df.columns:
+    for col in missing.index:
         summary_rows.append({"metric": f"missing_{col}", "value": int(missing[col]), "pct": float(missing_pct[col])})
 
+    mismatches = metrics["country_mismatches"]
+    n_suggested = int(mismatches["suggested_lat"].notna().sum())
+    summary_rows.append({"metric": "country_mismatches", "value": len(mismatches)})
+    summary_rows.append({"metric": "country_swap_suggestions", "value": n_suggested})
+    summary_rows.append({"metric": "country_unchecked", "value": metrics["country_unchecked"]})
+
     summary = pd.DataFrame(summary_rows)
     summary.to_csv(out_dir / "qa_summary.csv", index=False)
+    mismatches.to_csv(out_dir / "country_mismatches.csv", index=False)
 
-    country_counts = canonical["country_iso2"].value_counts()
+    country_counts = metrics["country_counts"]
     top_countries = country_counts.head(10)
     other_count = int(country_counts.iloc[10:].sum())
-
-    valid_types = set(df["facility_type"].dropna().unique())
-    invalid_types = sorted(valid_types - ALLOWED_FACILITY_TYPES)
-
-    raw_compare = df[(df["geocode_method"].isin(["cached_geocode", "online_geocode"])) & df["has_valid_coords"]]
-    precision_text = "not applicable with offline cache only"
-    if not raw_compare.empty and {"raw_lat", "raw_lon"}.issubset(df.columns):
-        subset = raw_compare.dropna(subset=["raw_lat", "raw_lon", "lat", "lon"]).copy()
-        if not subset.empty:
-            subset["distance_km"] = haversine_km(subset["raw_lat"], subset["raw_lon"], subset["lat"], subset["lon"])
-            precision_text = (
-                f"mean={subset['distance_km'].mean():.2f} km, "
-                f"median={subset['distance_km'].median():.2f} km, "
-                f"p95={subset['distance_km'].quantile(0.95):.2f} km"
-            )
+    invalid_types = sorted(metrics["facility_types"] - ALLOWED_FACILITY_TYPES)
+    precision_text = metrics["precision_text"]
 
     md = [
         "# QA/QC Report - Logistics Facility Registry v1",
         "",
         "## Row Counts",
-        f"- Raw rows: {len(raw_df)}",
-        f"- Processed rows: {len(df)}",
-        f"- Canonical rows: {len(canonical)}",
+        f"- Raw rows: {metrics['raw_rows']}",
+        f"- Processed rows: {n}",
+        f"- Canonical rows: {metrics['canonical_rows']}",
         "",
         "## Missingness",
     ]
-    for col in df.columns:
+    for col in missing.index:
         md.append(f"- {col}: {int(missing[col])} ({missing_pct[col]:.2f}%)")
 
     md.extend([
@@ -81,7 +136,7 @@ def generate_qa(raw_df: pd.DataFrame, df: pd.DataFrame, out_of_range_fixes: int,
     if len(dup_sizes) > 0:
         md.append(f"- Group size min/median/max: {int(dup_sizes.min())}/{float(dup_sizes.median()):.1f}/{int(dup_sizes.max())}")
         md.append("- Top 10 largest groups:")
-        for gid, size in dup_sizes.sort_values(ascending=False).head(10).items():
+        for gid, size in dup_sizes.sort_values(ascending=False, kind="stable").head(10).items():
             md.append(f"  - {gid}: {int(size)}")
 
     md.extend([
@@ -96,16 +151,21 @@ def generate_qa(raw_df: pd.DataFrame, df: pd.DataFrame, out_of_range_fixes: int,
     md.extend([
         "",
         "## Coordinate Validity",
-        f"- Valid coordinates: {df['has_valid_coords'].mean() * 100:.2f}%",
-        f"- Missing coordinates: {(~df['has_valid_coords']).mean() * 100:.2f}%",
+        f"- Valid coordinates: {valid_share * 100:.2f}%",
+        f"- Missing coordinates: {invalid_share * 100:.2f}%",
         f"- Out-of-range fixes applied: {out_of_range_fixes}",
         "",
+        "## Country Consistency",
+        f"- Coordinates outside declared country: {len(mismatches)}",
+        f"- Lat/lon transposition suggested: {n_suggested}",
+        f"- Not checked (no bundled outline for declared country): {metrics['country_unchecked']}",
+        "",
         "## Geocode Precision Proxy",
         f"- {precision_text}",
         "",
         "## Sanity Checks",
-        f"- Lat/Lon range check passed: {bool((df['lat'].dropna().between(-90, 90) & df['lon'].dropna().between(-180, 180)).all())}",
-        f"- Canonical with non-empty country_iso2: {bool((canonical['country_iso2'].str.len() == 2).all())}",
+        f"- Lat/Lon range check passed: {metrics['coord_ranges_ok']}",
+        f"- Canonical with non-empty country_iso2: {metrics['canonical_iso2_ok']}",
         f"- Facility type restricted to allowed set: {len(invalid_types) == 0}",
         "",
         "## Data Limitations",
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from facility_registry.io import atomic_write
+from facility_registry.qa import haversine_km
+
+EARTH_RADIUS_KM = 6371.0
+HALF_CIRCUMFERENCE_KM = np.pi * EARTH_RADIUS_KM
+FILTER_COLUMNS = ("facility_type", "country_iso2", "operator")
+TEXT_COLUMNS = ("facility_id", "facility_name")
+# Filtered queries search a tree over just the matching records; trees are kept per filter combination.
+MAX_CACHED_FILTERS = 64
+
+Filter = str | Iterable[str] | None
+
+
+def _as_array(value, dtype=float) -> np.ndarray:
+    return np.atleast_1d(np.asarray(value, dtype=dtype))
+
+
+def _wrap_lon(lon: np.ndarray) -> np.ndarray:
+    return np.where(np.abs(lon) > 180.0, ((lon + 180.0) % 360.0) - 180.0, lon)
+
+
+def _split_antimeridian(
+    qid: np.ndarray, xmin: np.ndarray, ymin: np.ndarray, xmax: np.ndarray, ymax: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (query ids, boxes), splitting boxes whose lon range leaves [-180, 180]."""
+    west = xmin < -180.0
+    east = xmax > 180.0
+    ids = [qid, qid[west], qid[east]]
+    boxes = [
+        shapely.box(np.where(west, -180.0, xmin), ymin, np.where(east, 180.0, xmax), ymax),
+        shapely.box(xmin[west] + 360.0, ymin[west], 180.0, ymax[west]),
+        shapely.box(-180.0, ymin[east], xmax[east] - 360.0, ymax[east]),
+    ]
+    return np.concatenate(ids), np.concatenate(boxes)
+
+
+def _radius_boxes(lat: np.ndarray, lon: np.ndarray, radius_km: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Lat/lon envelopes that fully contain each great-circle search disc."""
+    d = np.minimum(radius_km / EARTH_RADIUS_KM, np.pi)
+    dlat = np.degrees(d)
+    ymin = lat - dlat
+    ymax = lat + dlat
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.sin(d) / np.cos(np.radians(lat))
+    full = (ymin <= -90.0) | (ymax >= 90.0) | (d >= np.pi / 2) | ~(ratio < 1.0)
+    dlon = np.degrees(np.arcsin(np.where(full, 0.0, ratio)))
+    xmin = np.where(full, -180.0, lon - dlon)
+    xmax = np.where(full, 180.0, lon + dlon)
+    return _split_antimeridian(np.arange(len(lat)), xmin, np.maximum(ymin, -90.0), xmax, np.minimum(ymax, 90.0))
+
+
+def _filter_key(filters: dict[str, Filter]) -> tuple:
+    key = []
+    for col, wanted in sorted(filters.items()):
+        if wanted is not None:
+            key.append((col, (wanted,) if isinstance(wanted, str) else tuple(sorted(wanted))))
+    return tuple(key)
+
+
+def _rank_within_query(qid: np.ndarray) -> np.ndarray:
+    """Position of each element within its run of equal (sorted) query ids."""
+    starts = np.searchsorted(qid, qid, side="left")
+    return np.arange(len(qid)) - starts
+
+
+class FacilityIndex:
+    """Spatial index over canonical registry records for radius, k-nearest and bbox lookups.
+
+    Points are held in a shapely STRtree keyed on lon/lat; candidate sets from the tree are
+    refined with exact haversine distances. All query methods accept scalars or arrays and
+    return one long frame with a ``query_idx`` column pointing back at the input position.
+    """
+
+    def __init__(
+        self,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        text: dict[str, np.ndarray],
+        codes: dict[str, np.ndarray],
+        categories: dict[str, np.ndarray],
+    ) -> None:
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.text = text
+        self.codes = codes
+        self.categories = categories
+        self.tree = shapely.STRtree(shapely.points(self.lon, self.lat))
+        self._subset_trees: OrderedDict[tuple, tuple[shapely.STRtree, np.ndarray]] = OrderedDict()
+        self._subset_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, canonical_only: bool = True) -> FacilityIndex:
+        mask = df["has_valid_coords"].astype(bool)
+        if canonical_only:
+            mask &= df["is_canonical_record"].astype(bool)
+        records = df[mask]
+        text = {col: records[col].fillna("").astype(str).to_numpy(dtype=str) for col in TEXT_COLUMNS}
+        codes: dict[str, np.ndarray] = {}
+        categories: dict[str, np.ndarray] = {}
+        for col in FILTER_COLUMNS:
+            cat = pd.Categorical(records[col].fillna("").astype(str))
+            codes[col] = cat.codes.astype(np.int32)
+            categories[col] = np.asarray(cat.categories, dtype=str)
+        return cls(records["lat"].to_numpy(dtype=float), records["lon"].to_numpy(dtype=float), text, codes, categories)
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays: dict[str, np.ndarray] = {"lat": self.lat, "lon": self.lon}
+        arrays.update({f"text_{c}": v for c, v in self.text.items()})
+        arrays.update({f"codes_{c}": v for c, v in self.codes.items()})
+        arrays.update({f"categories_{c}": v for c, v in self.categories.items()})
+        with atomic_write(path) as tmp, tmp.open("wb") as fh:
+            np.savez(fh, **arrays)
+
+    @classmethod
+    def load(cls, path: str | Path) -> FacilityIndex:
+        with np.load(path, allow_pickle=False) as data:
+            text = {c: data[f"text_{c}"] for c in TEXT_COLUMNS}
+            codes = {c: data[f"codes_{c}"] for c in FILTER_COLUMNS}
+            categories = {c: data[f"categories_{c}"] for c in FILTER_COLUMNS}
+            return cls(data["lat"], data["lon"], text, codes, categories)
+
+    def eligible(self, **filters: Filter) -> np.ndarray:
+        """Boolean mask of indexed records matching attribute filters (value or collection of values)."""
+        mask = np.ones(len(self), dtype=bool)
+        for col, wanted in filters.items():
+            if col not in FILTER_COLUMNS:
+                raise ValueError(f"Unsupported filter column: {col}")
+            if wanted is None:
+                continue
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            wanted_codes = np.flatnonzero(np.isin(self.categories[col], values))
+            mask &= np.isin(self.codes[col], wanted_codes)
+        return mask
+
+    def _search_tree(self, filters: dict[str, Filter]) -> tuple[shapely.STRtree, np.ndarray | None]:
+        """STRtree over the records matching ``filters`` and their row numbers (None when all match).
+
+        Querying the full tree and masking afterwards would make every record a candidate when
+        only a few match, since the nearest-search radius grows with the sparsity of the filter.
+        """
+        key = _filter_key(filters)
+        if not key:
+            return self.tree, None
+        with self._subset_lock:
+            cached = self._subset_trees.get(key)
+            if cached is not None:
+                self._subset_trees.move_to_end(key)
+                return cached
+        rows = np.flatnonzero(self.eligible(**filters))
+        if len(rows) == len(self):
+            return self.tree, None
+        cached = (shapely.STRtree(shapely.points(self.lon[rows], self.lat[rows])), rows)
+        with self._subset_lock:
+            self._subset_trees[key] = cached
+            while len(self._subset_trees) > MAX_CACHED_FILTERS:
+                self._subset_trees.popitem(last=False)
+        return cached
+
+    def _frame(self, qid: np.ndarray, rows: np.ndarray, distance_km: np.ndarray | None = None) -> pd.DataFrame:
+        out = {"query_idx": qid}
+        out.update({col: self.text[col][rows] for col in TEXT_COLUMNS})
+        out.update({col: self.categories[col][self.codes[col][rows]] for col in FILTER_COLUMNS})
+        out["lat"] = self.lat[rows]
+        out["lon"] = self.lon[rows]
+        if distance_km is not None:
+            out["distance_km"] = distance_km
+        return pd.DataFrame(out)
+
+    def _pairs_within(
+        self,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        radius_km: np.ndarray,
+        tree: shapely.STRtree,
+        tree_rows: np.ndarray | None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(query id, row, distance) for records of ``tree`` within radius, sorted by query then distance."""
+        n = len(tree.geometries)
+        if n == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+        box_qid, boxes = _radius_boxes(lat, lon, radius_km)
+        box_idx, rows = tree.query(boxes)
+        qid = box_qid[box_idx]
+        key = np.unique(qid.astype(np.int64) * n + rows)
+        qid, rows = key // n, key % n
+        if tree_rows is not None:
+            rows = tree_rows[rows]
+        dist = haversine_km(lat[qid], lon[qid], self.lat[rows], self.lon[rows])
+        keep = dist <= radius_km[qid]
+        qid, rows, dist = qid[keep], rows[keep], dist[keep]
+        order = np.lexsort((dist, qid))
+        return qid[order], rows[order], dist[order]
+
+    def within_radius(self, lat, lon, radius_km, **filters: Filter) -> pd.DataFrame:
+        lat, lon = _as_array(lat), _wrap_lon(_as_array(lon))
+        radius = np.broadcast_to(_as_array(radius_km), lat.shape).astype(float)
+        qid, rows, dist = self._pairs_within(lat, lon, radius, *self._search_tree(filters))
+        return self._frame(qid, rows, dist)
+
+    def nearest(self, lat, lon, k: int = 1, max_radius_km: float | None = None, **filters: Filter) -> pd.DataFrame:
+        """k nearest eligible records per query point, optionally capped at ``max_radius_km``.
+
+        The search radius starts from the expected spacing of eligible records and grows
+        geometrically only for the query points that have not yet collected k hits.
+        """
+        return self._frame(*self.nearest_rows(lat, lon, k, max_radius_km, **filters))
+
+    def nearest_rows(
+        self, lat, lon, k: int = 1, max_radius_km: float | None = None, **filters: Filter
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Array form of ``nearest``: (query id, index row, distance) sorted by query then distance."""
+        lat, lon = _as_array(lat), _wrap_lon(_as_array(lon))
+        tree, tree_rows = self._search_tree(filters)
+        n_eligible = len(tree.geometries)
+        k = min(int(k), n_eligible)
+        limit = HALF_CIRCUMFERENCE_KM if max_radius_km is None else min(float(max_radius_km), HALF_CIRCUMFERENCE_KM)
+        if k <= 0 or len(lat) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+
+        start = np.sqrt(k * 4 * EARTH_RADIUS_KM**2 / n_eligible) * 1.5
+        radius = np.full(len(lat), min(start, limit))
+        pending = np.arange(len(lat))
+        found: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        while len(pending):
+            qid, rows, dist = self._pairs_within(lat[pending], lon[pending], radius[pending], tree, tree_rows)
+            counts = np.bincount(qid, minlength=len(pending))
+            done = (counts >= k) | (radius[pending] >= limit)
+            keep = done[qid] & (_rank_within_query(qid) < k)
+            found.append((pending[qid[keep]], rows[keep], dist[keep]))
+            pending = pending[~done]
+            radius[pending] = np.minimum(radius[pending] * 4, limit)
+
+        qid, rows, dist = (np.concatenate(parts) for parts in zip(*found))
+        order = np.lexsort((dist, qid))
+        return qid[order], rows[order], dist[order]
+
+    def within_bbox(self, min_lon, min_lat, max_lon, max_lat, **filters: Filter) -> pd.DataFrame:
+        """Records inside lon/lat boxes; ``min_lon > max_lon`` denotes a box crossing the antimeridian."""
+        min_lon, max_lon = _wrap_lon(_as_array(min_lon)), _wrap_lon(_as_array(max_lon))
+        min_lat, max_lat = _as_array(min_lat), _as_array(max_lat)
+        max_lon = np.where(min_lon > max_lon, max_lon + 360.0, max_lon)
+        box_qid, boxes = _split_antimeridian(np.arange(len(min_lon)), min_lon, min_lat, max_lon, max_lat)
+        tree, tree_rows = self._search_tree(filters)
+        box_idx, rows = tree.query(boxes)
+        qid = box_qid[box_idx]
+        if tree_rows is not None:
+            rows = tree_rows[rows]
+        order = np.lexsort((rows, qid))
+        return self._frame(qid[order], rows[order])
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz
+
+from facility_registry.io import atomic_write
+from facility_registry.normalize import clean_text
+
+FIELDS = ("facility_name", "address_full")
+_PREFIX = {"facility_name": "n", "address_full": "a"}
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_search_text(value: object) -> str:
+    return _NON_ALNUM.sub(" ", clean_text(value, lower=True)).strip()
+
+
+def _terms(text: str, prefix: str) -> set[str]:
+    """Whole tokens plus padded character trigrams, namespaced by field."""
+    terms: set[str] = set()
+    for token in text.split():
+        terms.add(f"{prefix}:{token}")
+        padded = f" {token} "
+        terms.update(f"{prefix}#{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return terms
+
+
+def _query_terms(name: str, address: str) -> set[str]:
+    return _terms(name, _PREFIX["facility_name"]) | _terms(address, _PREFIX["address_full"])
+
+
+class SearchIndex:
+    """Inverted token/trigram lists over canonical names and addresses, reranked with rapidfuzz.
+
+    Postings are stored CSR-style (``offsets`` into ``postings``) so the whole index is a handful
+    of flat arrays that save to and load from a single .npz file.
+    """
+
+    def __init__(
+        self,
+        terms: np.ndarray,
+        offsets: np.ndarray,
+        postings: np.ndarray,
+        docs: dict[str, np.ndarray],
+    ) -> None:
+        self.terms = terms
+        self.offsets = offsets
+        self.postings = postings
+        self.docs = docs
+        self.term_ids = {term: i for i, term in enumerate(terms.tolist())}
+        n_docs = max(len(self), 1)
+        self.doc_freq = np.diff(offsets)
+        self.idf = np.log1p(n_docs / np.maximum(self.doc_freq, 1)).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.docs["facility_id"])
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, canonical_only: bool = True) -> SearchIndex:
+        records = df[df["is_canonical_record"].astype(bool)] if canonical_only else df
+        docs = {
+            "facility_id": records["facility_id"].fillna("").astype(str).to_numpy(dtype=str),
+            "country_iso2": records["country_iso2"].fillna("").astype(str).to_numpy(dtype=str),
+        }
+        for col in FIELDS:
+            docs[col] = np.array([normalize_search_text(v) for v in records[col].tolist()], dtype=str)
+
+        vocab: dict[str, int] = {}
+        token_terms: dict[tuple[str, str], list[int]] = {}
+        doc_ids: list[int] = []
+        term_ids: list[int] = []
+        for doc, values in enumerate(zip(*(docs[col].tolist() for col in FIELDS))):
+            ids: set[int] = set()
+            for col, text in zip(FIELDS, values):
+                for token in text.split():
+                    key = (col, token)
+                    if key not in token_terms:
+                        token_terms[key] = [vocab.setdefault(t, len(vocab)) for t in _terms(token, _PREFIX[col])]
+                    ids.update(token_terms[key])
+            term_ids.extend(ids)
+            doc_ids.extend([doc] * len(ids))
+
+        term_arr = np.asarray(term_ids, dtype=np.int64)
+        doc_arr = np.asarray(doc_ids, dtype=np.int32)
+        order = np.lexsort((doc_arr, term_arr))
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_arr, minlength=len(vocab)), out=offsets[1:])
+        terms = np.array(list(vocab), dtype=str) if vocab else np.array([], dtype=str)
+        return cls(terms, offsets, doc_arr[order], docs)
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {"terms": self.terms, "offsets": self.offsets, "postings": self.postings}
+        arrays.update({f"doc_{col}": values for col, values in self.docs.items()})
+        with atomic_write(path) as tmp, tmp.open("wb") as fh:
+            np.savez(fh, **arrays)
+
+    @classmethod
+    def load(cls, path: str | Path) -> SearchIndex:
+        with np.load(path, allow_pickle=False) as data:
+            docs = {key[len("doc_") :]: data[key] for key in data.files if key.startswith("doc_")}
+            return cls(data["terms"], data["offsets"], data["postings"], docs)
+
+    def _candidates(
+        self,
+        name: str,
+        address: str,
+        country_iso2: str | None,
+        max_candidates: int,
+        max_df: float,
+        max_postings: int,
+    ) -> np.ndarray:
+        ids = np.array([self.term_ids[t] for t in _query_terms(name, address) if t in self.term_ids], dtype=np.int64)
+        if len(ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        # Very common trigrams ("rd ", " st") carry little signal but dominate posting volume;
+        # short posting lists are always cheap enough to keep.
+        selective = ids[self.doc_freq[ids] <= max(max_df * len(self), 1000)]
+        ids = selective if len(selective) else ids[np.argsort(self.doc_freq[ids])[:3]]
+        # Rarest terms first, stopping at a posting budget so per-query work stays bounded
+        # as the registry grows; the first (rarest) term is always kept.
+        ids = ids[np.argsort(self.doc_freq[ids], kind="stable")]
+        ids = ids[np.cumsum(self.doc_freq[ids]) - self.doc_freq[ids] < max_postings]
+
+        starts, ends = self.offsets[ids], self.offsets[ids + 1]
+        lengths = ends - starts
+        flat = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        # Score only the docs that appear in the selected postings, not the whole registry.
+        uniq, inverse = np.unique(self.postings[flat], return_inverse=True)
+        scores = np.bincount(inverse, weights=np.repeat(self.idf[ids], lengths))
+        if country_iso2:
+            keep = self.docs["country_iso2"][uniq] == country_iso2
+            uniq, scores = uniq[keep], scores[keep]
+        if len(uniq) > max_candidates:
+            top = np.argpartition(-scores, max_candidates - 1)[:max_candidates]
+            uniq = uniq[top]
+        return uniq
+
+    def search(
+        self,
+        name: str,
+        address: str = "",
+        country_iso2: str | None = None,
+        limit: int = 5,
+        max_candidates: int = 50,
+        max_df: float = 0.1,
+        max_postings: int = 20_000,
+    ) -> pd.DataFrame:
+        """Best registry matches for a free-text name (and optional address) record."""
+        name_n = normalize_search_text(name)
+        address_n = normalize_search_text(address)
+        docs = self._candidates(name_n, address_n, country_iso2, max_candidates, max_df, max_postings)
+        name_scores = np.array([fuzz.token_sort_ratio(name_n, v) for v in self.docs["facility_name"][docs].tolist()])
+        if address_n:
+            addr_scores = np.array([fuzz.token_sort_ratio(address_n, v) for v in self.docs["address_full"][docs].tolist()])
+            scores = (name_scores + addr_scores) / 2
+        else:
+            addr_scores = np.full(len(docs), np.nan)
+            scores = name_scores
+        order = np.argsort(-scores, kind="stable")[: max(int(limit), 0)]
+        return pd.DataFrame(
+            {
+                "facility_id": self.docs["facility_id"][docs[order]],
+                "score": scores[order].astype(float),
+                "name_score": name_scores[order].astype(float),
+                "address_score": addr_scores[order].astype(float),
+            }
+        )
+
+    def match_records(self, df: pd.DataFrame, limit: int = 1, **kwargs) -> pd.DataFrame:
+        """Look up incoming records one ``search`` call at a time; returns up to ``limit`` rows per input with ``query_idx``.
+
+        Each query's cost is bounded by its own posting lists and candidate rerank, so the loop
+        scales linearly with the number of inputs rather than with the registry size.
+        """
+        names = df["facility_name"].fillna("").tolist()
+        addresses = df["address_full"].fillna("").tolist() if "address_full" in df.columns else [""] * len(df)
+        countries = df["country_iso2"].fillna("").tolist() if "country_iso2" in df.columns else [None] * len(df)
+        parts = []
+        for i, (name, address, country) in enumerate(zip(names, addresses, countries)):
+            hits = self.search(name, address, country or None, limit=limit, **kwargs)
+            parts.append(hits.assign(query_idx=i))
+        if not parts:
+            return pd.DataFrame(columns=["query_idx", "facility_id", "score", "name_score", "address_score"])
+        out = pd.concat(parts, ignore_index=True)
+        return out[["query_idx", "facility_id", "score", "name_score", "address_score"]]
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from facility_registry.io import load_config
+from facility_registry.query import FILTER_COLUMNS, FacilityIndex
+from facility_registry.search import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CSV = "data/processed/facilities_master.csv"
+DEFAULT_INDEX = "data/processed/facilities_master_index.npz"
+DEFAULT_SEARCH = "data/processed/facilities_master_search.npz"
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH = 10_000
+# Fuzzy search and k-nearest cost far more per item than id lookups, so their bulk bodies are capped lower.
+MAX_SEARCH_BATCH = 1_000
+MAX_NEAREST_BATCH = 1_000
+# Routes answered inline on the event loop; everything else runs in a worker thread.
+_INLINE_ROUTES = {("GET", "/health"), ("GET", "/facilities"), ("POST", "/facilities")}
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Snapshot:
+    """Immutable in-memory view of one export; swapped atomically on reload."""
+
+    ids: dict[str, int]
+    records: list[bytes]
+    index: FacilityIndex
+    search: SearchIndex
+    version: tuple[float, ...] = field(default=())
+    # Encoded record for each spatial-index row, so nearest hits splice bytes like search hits.
+    index_records: list[bytes] = field(default_factory=list)
+
+
+def _file_version(paths: list[Path]) -> tuple[float, ...]:
+    return tuple(p.stat().st_mtime if p.exists() else 0.0 for p in paths)
+
+
+def load_snapshot(
+    csv_path: str | Path = DEFAULT_CSV,
+    index_path: str | Path = DEFAULT_INDEX,
+    search_path: str | Path = DEFAULT_SEARCH,
+) -> Snapshot:
+    csv_path, index_path, search_path = Path(csv_path), Path(index_path), Path(search_path)
+    version = _file_version([csv_path, index_path, search_path])
+    df = pd.read_csv(csv_path, dtype={"postal_code": str})
+    # pandas' C JSON writer encodes every record once; requests then only splice bytes.
+    lines = df.to_json(orient="records", lines=True).splitlines() if len(df) else []
+    records = [line.encode("utf-8") for line in lines]
+    ids = {fid: pos for pos, fid in enumerate(df["facility_id"].astype(str))}
+    index = FacilityIndex.load(index_path) if index_path.exists() else FacilityIndex.from_frame(df)
+    search = SearchIndex.load(search_path) if search_path.exists() else SearchIndex.from_frame(df)
+    index_records = [records[ids[fid]] if fid in ids else b"null" for fid in index.text["facility_id"].tolist()]
+    return Snapshot(ids, records, index, search, version, index_records)
+
+
+def _json(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _lookup(snap: Snapshot, facility_ids: list[str]) -> bytes:
+    parts = [snap.records[snap.ids[fid]] if fid in snap.ids else b"null" for fid in facility_ids]
+    return b'{"results":[' + b",".join(parts) + b"]}"
+
+
+def _search(snap: Snapshot, queries: list[dict[str, Any]], limit: int) -> list[bytes]:
+    """Encoded hit lists, one JSON array of {score, facility} objects per query."""
+    out = []
+    for q in queries:
+        hits = snap.search.search(
+            str(q.get("facility_name", "")),
+            str(q.get("address_full", "")),
+            q.get("country_iso2") or None,
+            limit=limit,
+        )
+        items = [
+            b'{"score":%.2f,"facility":%b}' % (score, snap.records[snap.ids[fid]])
+            for fid, score in zip(hits["facility_id"].tolist(), hits["score"].tolist())
+            if fid in snap.ids
+        ]
+        out.append(b"[" + b",".join(items) + b"]")
+    return out
+
+
+def _search_query(item: Any) -> dict[str, Any]:
+    return {"facility_name": item} if isinstance(item, str) else dict(item)
+
+
+def _filters(source: dict[str, Any]) -> dict[str, Any]:
+    return {col: source[col] for col in FILTER_COLUMNS if source.get(col) not in (None, "", [])}
+
+
+def _nearest(
+    snap: Snapshot, points: list[list[float]], k: int, max_radius_km: float | None, filters: dict[str, Any]
+) -> list[bytes]:
+    """Encoded hit lists, one JSON array of {distance_km, facility} objects per point."""
+    lat = [float(p[0]) for p in points]
+    lon = [float(p[1]) for p in points]
+    qid, rows, dist = snap.index.nearest_rows(lat, lon, k=k, max_radius_km=max_radius_km, **filters)
+    grouped: list[list[bytes]] = [[] for _ in points]
+    for q, row, d in zip(qid.tolist(), rows.tolist(), dist.tolist()):
+        grouped[q].append(b'{"distance_km":%.3f,"facility":%b}' % (d, snap.index_records[row]))
+    return [b"[" + b",".join(items) + b"]" for items in grouped]
+
+
+def _param(query: dict[str, list[str]], name: str, default: Any = None, cast=str) -> Any:
+    if name not in query:
+        if default is None:
+            raise RequestError(400, f"missing parameter: {name}")
+        return default
+    try:
+        return cast(query[name][-1])
+    except ValueError as exc:
+        raise RequestError(400, f"invalid parameter: {name}") from exc
+
+
+def _positive(value: Any, name: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise RequestError(400, f"{name} must be at least 1")
+    return number
+
+
+def _batch(body: dict[str, Any], key: str, limit: int = MAX_BATCH) -> list[Any]:
+    items = body.get(key)
+    if not isinstance(items, list):
+        raise RequestError(400, f"expected a list in '{key}'")
+    if len(items) > limit:
+        raise RequestError(413, f"at most {limit} items per request")
+    return items
+
+
+def _runs_inline(method: str, target: str) -> bool:
+    """Id lookups are dict hits; search and nearest queries are offloaded so they cannot stall the loop."""
+    path = urlsplit(target).path.rstrip("/")
+    if path.startswith("/facilities/"):
+        path = "/facilities"
+    return (method, path) in _INLINE_ROUTES
+
+
+def dispatch(snap: Snapshot, method: str, target: str, body: bytes = b"") -> tuple[int, bytes]:
+    """Route one request against a snapshot and return (status, JSON body)."""
+    parts = urlsplit(target)
+    path = parts.path.rstrip("/") or "/"
+    query = parse_qs(parts.query)
+    try:
+        payload = json.loads(body) if method == "POST" else {}
+        if not isinstance(payload, dict):
+            raise RequestError(400, "expected a JSON object")
+
+        if path == "/health" and method == "GET":
+            return 200, _json({"status": "ok", "records": len(snap.records), "indexed": len(snap.index)})
+
+        if path.startswith("/facilities/") and method == "GET":
+            fid = unquote(path[len("/facilities/") :])
+            if fid not in snap.ids:
+                raise RequestError(404, f"unknown facility_id: {fid}")
+            return 200, snap.records[snap.ids[fid]]
+        if path == "/facilities" and method == "POST":
+            return 200, _lookup(snap, [str(fid) for fid in _batch(payload, "facility_ids")])
+
+        if path == "/search" and method == "GET":
+            q = {
+                "facility_name": _param(query, "q"),
+                "address_full": _param(query, "address", ""),
+                "country_iso2": _param(query, "country_iso2", ""),
+            }
+            results = _search(snap, [q], _positive(_param(query, "limit", 10, int), "limit"))
+            return 200, b'{"results":' + results[0] + b"}"
+        if path == "/search" and method == "POST":
+            queries = [_search_query(q) for q in _batch(payload, "queries", MAX_SEARCH_BATCH)]
+            results = _search(snap, queries, _positive(payload.get("limit", 10), "limit"))
+            return 200, b'{"results":[' + b",".join(results) + b"]}"
+
+        if path == "/nearest" and method == "GET":
+            point = [[_param(query, "lat", cast=float), _param(query, "lon", cast=float)]]
+            radius = _param(query, "max_radius_km", 0.0, float) or None
+            filters = _filters({col: query[col] for col in FILTER_COLUMNS if col in query})
+            hits = _nearest(snap, point, _positive(_param(query, "k", 1, int), "k"), radius, filters)
+            return 200, b'{"results":' + hits[0] + b"}"
+        if path == "/nearest" and method == "POST":
+            points = _batch(payload, "points", MAX_NEAREST_BATCH)
+            k = _positive(payload.get("k", 1), "k")
+            hits = _nearest(snap, points, k, payload.get("max_radius_km"), _filters(payload))
+            return 200, b'{"results":[' + b",".join(hits) + b"]}"
+
+        if path in {"/health", "/facilities", "/search", "/nearest"} or path.startswith("/facilities/"):
+            raise RequestError(405, f"{method} not supported on {path}")
+        raise RequestError(404, f"no route for {path}")
+    except RequestError as exc:
+        return exc.status, _json({"error": str(exc)})
+    except (ValueError, TypeError, IndexError, KeyError) as exc:
+        return 400, _json({"error": f"bad request: {exc}"})
+
+
+class RegistryService:
+    """Read-only HTTP/1.1 front end over a warm Snapshot, reloading when the export changes."""
+
+    def __init__(
+        self,
+        csv_path: str | Path,
+        index_path: str | Path,
+        search_path: str | Path = DEFAULT_SEARCH,
+        reload_interval: float = 2.0,
+    ) -> None:
+        self.paths = [Path(csv_path), Path(index_path), Path(search_path)]
+        self.reload_interval = reload_interval
+        self.snapshot = load_snapshot(*self.paths)
+
+    async def watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            if _file_version(self.paths) == self.snapshot.version:
+                continue
+            try:
+                self.snapshot = await asyncio.to_thread(load_snapshot, *self.paths)
+                logger.info("Reloaded registry: %s records", len(self.snapshot.records))
+            except Exception:  # keep serving the previous snapshot if a half-written export fails to load
+                logger.exception("Registry reload failed; keeping previous snapshot")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, version = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0"))
+                if length > MAX_BODY_BYTES:
+                    status, body = 413, _json({"error": "request body too large"})
+                    keep_alive = False
+                else:
+                    payload = await reader.readexactly(length) if length else b""
+                    method = method.upper()
+                    if _runs_inline(method, target):
+                        status, body = dispatch(self.snapshot, method, target, payload)
+                    else:
+                        status, body = await asyncio.to_thread(dispatch, self.snapshot, method, target, payload)
+                    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle, host, port)
+        watcher = asyncio.create_task(self.watch())
+        logger.info("Serving %s records on http://%s:%s", len(self.snapshot.records), host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
+    cfg = load_config().get("service", {}) if Path("config/config.yaml").exists() else {}
+    parser = argparse.ArgumentParser(description="Serve read-only registry lookups over HTTP.")
+    parser.add_argument("--host", default=cfg.get("host", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=cfg.get("port", 8080))
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--index", default=DEFAULT_INDEX)
+    parser.add_argument("--search-index", default=DEFAULT_SEARCH)
+    parser.add_argument("--reload-interval", type=float, default=cfg.get("reload_interval", 2.0))
+    args = parser.parse_args(argv)
+    service = RegistryService(args.csv, args.index, args.search_index, args.reload_interval)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = "caches/stages"
+DEFAULT_MAX_SIZE_MB = 512
+_BLOCK = 1 << 20
+
+
+def parse_stage_args(description: str | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--force", action="store_true", help="re-run the stage even if its inputs are unchanged")
+    return parser.parse_args()
+
+
+def file_digest(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as fh:
+        for block in iter(lambda: fh.read(_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _code_digest(paths: tuple[Path, ...]) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(path.name.encode("utf-8"))
+        h.update(file_digest(path).encode("ascii"))
+    return h.hexdigest()
+
+
+def package_modules(*names: str) -> list[Path]:
+    """Source files of the named facility_registry modules, for a stage's ``code_paths``."""
+    return [PACKAGE_DIR / f"{name}.py" for name in names]
+
+
+def code_version(paths: Iterable[str | Path] = ()) -> str:
+    """Digest of the code a stage depends on: its script plus the package modules it uses."""
+    return _code_digest(tuple(Path(p).resolve() for p in paths))
+
+
+def stage_key(stage: str, inputs: Iterable[str | Path], params: dict[str, Any], code: str) -> str:
+    h = hashlib.sha256()
+    h.update(f"stage={stage}\ncode={code}\n".encode("utf-8"))
+    h.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    for path in inputs:
+        path = Path(path)
+        digest = file_digest(path) if path.exists() else "missing"
+        h.update(f"\n{path.as_posix()}={digest}".encode("utf-8"))
+    return h.hexdigest()
+
+
+class StageCache:
+    """Content-addressed store of stage outputs with LRU eviction by total object size.
+
+    ``objects/`` holds output files keyed by their sha256; ``entries/<key>.json`` maps a stage
+    key to the output paths and object digests it produced. Entry mtimes record last use.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_SIZE_MB << 20) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects = self.root / "objects"
+        self.entries = self.root / "entries"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def restore(self, key: str, outputs: Iterable[str | Path]) -> bool:
+        entry = self.entries / f"{key}.json"
+        if not entry.exists():
+            return False
+        manifest = json.loads(entry.read_text(encoding="utf-8"))
+        wanted = [Path(p).as_posix() for p in outputs]
+        if sorted(manifest["outputs"]) != sorted(wanted):
+            return False
+        sources = {p: self._object_path(d) for p, d in manifest["outputs"].items()}
+        if not all(src.exists() for src in sources.values()):
+            return False
+        for dest, src in sources.items():
+            dest = Path(dest)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            # Copy then rename, so readers watching dest never see a half-restored file.
+            tmp = dest.with_name(f".{dest.name}.restore")
+            shutil.copyfile(src, tmp)
+            tmp.replace(dest)
+        os.utime(entry)
+        return True
+
+    def store(self, key: str, stage: str, outputs: Iterable[str | Path]) -> None:
+        manifest: dict[str, str] = {}
+        for path in map(Path, outputs):
+            if not path.exists():
+                logger.warning("Stage %s did not produce %s; not caching", stage, path)
+                return
+            digest = file_digest(path)
+            target = self._object_path(digest)
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_suffix(".tmp")
+                shutil.copyfile(path, tmp)
+                tmp.replace(target)
+            manifest[path.as_posix()] = digest
+        self.entries.mkdir(parents=True, exist_ok=True)
+        (self.entries / f"{key}.json").write_text(json.dumps({"stage": stage, "outputs": manifest}), encoding="utf-8")
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop least recently used entries, then unreferenced objects, until under max_bytes."""
+        if not self.entries.exists():
+            return
+        entries = sorted(self.entries.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        refs = {e: set(json.loads(e.read_text(encoding="utf-8"))["outputs"].values()) for e in entries}
+        sizes = {p.name: p.stat().st_size for p in self.objects.glob("*/*") if p.suffix != ".tmp"}
+        total = sum(sizes.values())
+        while total > self.max_bytes and entries:
+            oldest = entries.pop(0)
+            oldest.unlink()
+            refs.pop(oldest)
+            live = set().union(*refs.values())
+            for digest in [d for d in sizes if d not in live]:
+                self._object_path(digest).unlink(missing_ok=True)
+                total -= sizes.pop(digest)
+
+
+def run_stage(
+    stage: str,
+    build: Callable[[], None],
+    inputs: Iterable[str | Path],
+    outputs: Iterable[str | Path],
+    params: dict[str, Any],
+    cache_cfg: dict[str, Any] | None = None,
+    force: bool = False,
+    code_paths: Iterable[str | Path] = (),
+) -> bool:
+    """Run ``build`` unless a cached result exists for the same inputs, params and code.
+
+    ``code_paths`` lists the source files whose edits should invalidate the stage; other
+    package modules can change without re-running it.
+
+    Returns True when outputs were restored from the cache.
+    """
+    cache_cfg = cache_cfg or {}
+    cache = StageCache(
+        cache_cfg.get("dir", DEFAULT_CACHE_DIR),
+        int(cache_cfg.get("max_size_mb", DEFAULT_MAX_SIZE_MB)) << 20,
+    )
+    outputs = list(outputs)
+    key = stage_key(stage, inputs, params, code_version(code_paths))
+    if not force and cache.restore(key, outputs):
+        logger.info("Stage %s inputs unchanged; restored outputs from cache", stage)
+        return True
+    build()
+    cache.store(key, stage, outputs)
+    return False
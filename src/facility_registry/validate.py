@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from facility_registry import REQUIRED_SCHEMA, SCHEMA_RULES
+
+ERROR_COLUMN = "validation_errors"
+_BOOL_TOKENS = frozenset({"true", "false", "1", "0", "1.0", "0.0"})
+
+Failure = tuple[str, np.ndarray]
+ColumnCheck = Callable[[pd.DataFrame], list[Failure]]
+
+
+def _per_unique(s: pd.Series, fn: Callable[[str], bool]) -> np.ndarray:
+    """Evaluate a scalar string predicate once per distinct value and broadcast it back."""
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    if len(uniques) == 0:
+        return np.zeros(len(s), dtype=bool)
+    values = np.asarray(uniques, dtype=object).tolist()
+    hits = np.fromiter((fn(str(v)) for v in values), dtype=bool, count=len(values))
+    return np.where(codes >= 0, hits[codes], False)
+
+
+def _blank_mask(s: pd.Series) -> np.ndarray:
+    blank = s.isna().to_numpy()
+    if not (pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s)):
+        blank = blank | _per_unique(s, lambda v: not v.strip())
+    return blank
+
+
+def _compile_column(column: str, rule: dict[str, object]) -> ColumnCheck:
+    dtype = rule.get("dtype", "str")
+    nullable = bool(rule.get("nullable", True))
+    allowed = frozenset(rule["allowed"]) if "allowed" in rule else None
+    pattern = re.compile(str(rule["pattern"])) if "pattern" in rule else None
+    lo = rule.get("min")
+    hi = rule.get("max")
+
+    def check(df: pd.DataFrame) -> list[Failure]:
+        if column not in df.columns:
+            return [(f"{column}:missing", np.ones(len(df), dtype=bool))]
+        s = df[column]
+        blank = _blank_mask(s)
+        present = ~blank
+        failures: list[Failure] = []
+        if not nullable:
+            failures.append((f"{column}:null", blank))
+
+        if dtype == "float":
+            values = pd.to_numeric(s, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            failures.append((f"{column}:type", present & np.isnan(values)))
+            with np.errstate(invalid="ignore"):
+                out = np.zeros(len(values), dtype=bool)
+                if lo is not None:
+                    out |= values < float(lo)
+                if hi is not None:
+                    out |= values > float(hi)
+            failures.append((f"{column}:range", out))
+        elif dtype == "bool" and not pd.api.types.is_bool_dtype(s):
+            is_token = _per_unique(s, lambda v: v.strip().lower() in _BOOL_TOKENS)
+            failures.append((f"{column}:type", present & ~is_token))
+
+        if allowed is not None:
+            failures.append((f"{column}:allowed", present & ~_per_unique(s, lambda v: v.strip() in allowed)))
+        if pattern is not None:
+            matched = _per_unique(s, lambda v: pattern.fullmatch(v.strip()) is not None)
+            failures.append((f"{column}:pattern", present & ~matched))
+        return failures
+
+    return check
+
+
+def compile_schema(
+    rules: dict[str, dict[str, object]] = SCHEMA_RULES,
+    columns: list[str] = REQUIRED_SCHEMA,
+) -> list[ColumnCheck]:
+    """Compile column rules once into vectorized per-chunk checks."""
+    return [_compile_column(col, rules.get(col, {})) for col in columns]
+
+
+def apply_schema_defaults(df: pd.DataFrame, rules: dict[str, dict[str, object]] = SCHEMA_RULES) -> pd.DataFrame:
+    for col in REQUIRED_SCHEMA:
+        if col not in df.columns:
+            df[col] = rules.get(col, {}).get("default", "")
+    return df
+
+
+def validate_chunk(df: pd.DataFrame, checks: list[ColumnCheck]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Split a chunk into (valid, quarantined); quarantined rows carry the failed rule labels."""
+    failures = [f for check in checks for f in check(df) if f[1].any()]
+    bad = np.zeros(len(df), dtype=bool)
+    for _, mask in failures:
+        bad |= mask
+
+    bad_idx = np.flatnonzero(bad)
+    reasons: list[list[str]] = [[] for _ in range(len(bad_idx))]
+    for label, mask in failures:
+        for pos in np.flatnonzero(mask[bad_idx]):
+            reasons[pos].append(label)
+
+    quarantined = df.iloc[bad_idx].copy()
+    quarantined[ERROR_COLUMN] = [";".join(r) for r in reasons]
+    return df.iloc[np.flatnonzero(~bad)], quarantined
+
+
+def iter_validated_chunks(
+    chunks: Iterable[pd.DataFrame],
+    checks: list[ColumnCheck],
+) -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
+    for chunk in chunks:
+        yield validate_chunk(chunk, checks)
+
+
+def validate_frame(
+    df: pd.DataFrame,
+    checks: list[ColumnCheck] | None = None,
+    chunksize: int = 100_000,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    checks = compile_schema() if checks is None else checks
+    chunks = (df.iloc[i : i + chunksize] for i in range(0, max(len(df), 1), chunksize))
+    valid_parts: list[pd.DataFrame] = []
+    bad_parts: list[pd.DataFrame] = []
+    for valid, bad in iter_validated_chunks(chunks, checks):
+        valid_parts.append(valid)
+        bad_parts.append(bad)
+    return pd.concat(valid_parts), pd.concat(bad_parts)
+
+
+def validate_csv(
+    src_path: str | Path,
+    valid_path: str | Path,
+    quarantine_path: str | Path,
+    chunksize: int = 100_000,
+    checks: list[ColumnCheck] | None = None,
+) -> dict[str, int]:
+    """Stream a CSV through the schema checks, writing valid and quarantined rows separately."""
+    checks = compile_schema() if checks is None else checks
+    valid_path = Path(valid_path)
+    quarantine_path = Path(quarantine_path)
+    valid_path.parent.mkdir(parents=True, exist_ok=True)
+    quarantine_path.parent.mkdir(parents=True, exist_ok=True)
+
+    counts = {"rows": 0, "valid": 0, "quarantined": 0}
+    first = True
+    for valid, bad in iter_validated_chunks(pd.read_csv(src_path, chunksize=chunksize), checks):
+        mode = "w" if first else "a"
+        valid.to_csv(valid_path, mode=mode, header=first, index=False)
+        bad.to_csv(quarantine_path, mode=mode, header=first, index=False)
+        first = False
+        counts["rows"] += len(valid) + len(bad)
+        counts["valid"] += len(valid)
+        counts["quarantined"] += len(bad)
+    return counts
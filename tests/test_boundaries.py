@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from facility_registry.boundaries import check_country_consistency, locate_countries
+
+
+def test_locate_countries_with_coastal_tolerance() -> None:
+    lat = [52.52, 40.71, 0.0, np.nan, 43.29]
+    lon = [13.40, -74.0, -30.0, 1.0, 5.37]
+    assert locate_countries(lat, lon, tolerance_deg=0).tolist()[:4] == ["DE", "US", "", ""]
+    assert locate_countries(lat, lon, tolerance_deg=0.25).tolist()[4] == "FR"
+
+
+def test_mismatch_flags_and_swap_suggestion() -> None:
+    df = pd.DataFrame(
+        {
+            "country_iso2": ["DE", "DE", "JP", "US", "BR"],
+            "lat": [52.52, 13.40, 35.68, np.nan, 10.0],
+            "lon": [13.40, 52.52, 139.70, np.nan, 10.0],
+        }
+    )
+    out = check_country_consistency(df)
+    assert out["coords_country_iso2"].tolist() == ["DE", "", "JP", "", "NG"]
+    assert out["country_mismatch"].tolist() == [False, True, False, False, True]
+    assert out.loc[1, ["suggested_lat", "suggested_lon"]].tolist() == [52.52, 13.40]
+    assert out[["suggested_lat", "suggested_lon"]].drop(index=1).isna().all().all()
+
+
+def test_countries_without_outline_are_unchecked() -> None:
+    df = pd.DataFrame(
+        {
+            "country_iso2": ["SG", "HK", "MT", "BH", "DE"],
+            "lat": [1.29, 22.3, 35.9, 26.2, 48.1],
+            "lon": [103.85, 114.17, 14.5, 50.6, 11.6],
+        }
+    )
+    out = check_country_consistency(df)
+    assert not out["country_mismatch"].any()
+    assert out["country_unchecked"].tolist() == [True, True, True, True, False]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from facility_registry.dedupe import restore_canonical_records
+from facility_registry.validate import validate_frame
+
+
+def test_quarantined_canonical_is_replaced_by_valid_sibling() -> None:
+    base = {
+        "facility_name": "Harbor Depot",
+        "facility_type": "warehouse",
+        "operator": "Kiteway Cargo",
+        "street": "1 Quay St",
+        "city": "Lisbon",
+        "state_region": "",
+        "postal_code": "1100",
+        "country_iso2": "PT",
+        "address_full": "1 Quay St, Lisbon, 1100, PT",
+        "lat": 38.7,
+        "lon": -9.1,
+        "has_valid_coords": True,
+        "duplicate_group_id": "DG-0001",
+        "is_canonical_record": False,
+        "geocode_method": "raw_coords",
+        "geocode_confidence": 0.9,
+        "source": "synthetic_v1",
+        "updated_at": "2024-01-01",
+    }
+    df = pd.DataFrame(
+        [
+            {**base, "facility_id": "FAC-00000001", "is_canonical_record": True, "country_iso2": "Portugal"},
+            {**base, "facility_id": "FAC-00000003", "operator": ""},
+            {**base, "facility_id": "FAC-00000002"},
+        ]
+    )
+    valid, bad = validate_frame(df)
+    assert bad["facility_id"].tolist() == ["FAC-00000001"]
+
+    valid = restore_canonical_records(valid)
+    canonical = valid.loc[valid["is_canonical_record"], "facility_id"].tolist()
+    assert canonical == ["FAC-00000002"]
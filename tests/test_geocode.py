@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from facility_registry.geocode import apply_geocoding
+
+
+def test_group_propagation_then_single_cache_lookup(tmp_path) -> None:
+    cache = tmp_path / "cache.csv"
+    pd.DataFrame(
+        {
+            "address_full": ["9 Dock Rd, Porto, PT"],
+            "country_iso2": ["PT"],
+            "lat": [41.15],
+            "lon": [-8.61],
+            "geocode_confidence": [0.75],
+        }
+    ).to_csv(cache, index=False)
+    df = pd.DataFrame(
+        {
+            "facility_name": ["North Hub", "North Hub Annex", "North Hub", "Dock Yard", "Dock Yard B", "Lone Site"],
+            "address_full": [
+                "1 Quay St, Lisbon, PT",
+                "1 Quay Street, Lisbon, PT",
+                "1 Quay St, Lisbon, PT",
+                "9 Dock Rd, Porto, PT",
+                "9 dock rd, porto, pt",
+                "5 Hill Rd, Faro, PT",
+            ],
+            "country_iso2": ["PT"] * 6,
+            "lat": [38.70, 38.80, np.nan, np.nan, np.nan, np.nan],
+            "lon": [-9.10, -9.20, np.nan, np.nan, np.nan, np.nan],
+            "has_valid_coords": [True, True, False, False, False, False],
+            "duplicate_group_id": ["DG-0001", "DG-0001", "DG-0001", "DG-0002", "DG-0002", np.nan],
+        }
+    )
+    out = apply_geocoding(df, cache)
+
+    assert out["geocode_method"].tolist() == [
+        "raw_coords",
+        "raw_coords",
+        "group_propagated",
+        "cached_geocode",
+        "cached_geocode",
+        "none",
+    ]
+    # Exact name/address sibling wins over the near match.
+    assert out.loc[2, ["lat", "lon"]].tolist() == [38.70, -9.10]
+    assert out.loc[2, "geocode_confidence"] == 0.90
+    assert out.loc[3:4, "lat"].tolist() == [41.15, 41.15]
+    assert out["has_valid_coords"].tolist() == [True, True, True, True, True, False]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+
+from facility_registry.ingest import (
+    MAPPING_RULES_VERSION,
+    ColumnMappingCache,
+    discover_sources,
+    header_signature,
+    ingest_sources,
+)
+from facility_registry.normalize import column_sources
+
+
+def test_underscored_headers_resolve() -> None:
+    sources = column_sources(["Street_Address", "country_name", "State Region"])
+    assert sources["street"] == ["Street_Address"]
+    assert sources["country"] == ["country_name"]
+    assert sources["state_region"] == ["State Region"]
+
+
+def test_ingest_merges_sources_and_caches_mappings(tmp_path) -> None:
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "partner_a.csv").write_text(
+        "FacilityName,Street_Address,City,country_name,Latitude,Longitude\n"
+        "Alpha Depot,1 Main St,Austin,United States,30.27,-97.74\n"
+        "Beta Yard,2 Side St,Dallas,USA,32.78,-96.80\n",
+        encoding="utf-8",
+    )
+    (raw / "partner_b.csv").write_text(
+        "name,address,zip,country,lat,lng,source\n"
+        "Gamma Hub,Hauptstr 3,10115,Germany,52.52,13.40,feed_x\n",
+        encoding="utf-8",
+    )
+    paths = discover_sources(raw)
+    cache = ColumnMappingCache(tmp_path / "mappings.json")
+    out, fixes = ingest_sources(paths, max_workers=2, mapping_cache=cache)
+
+    assert fixes == 0
+    assert out["facility_name"].tolist() == ["Alpha Depot", "Beta Yard", "Gamma Hub"]
+    assert out["country_iso2"].tolist() == ["US", "US", "DE"]
+    assert out["street"].tolist() == ["1 Main St", "2 Side St", "Hauptstr 3"]
+    assert out["source"].tolist() == ["partner_a", "partner_a", "feed_x"]
+    assert out["source_file"].tolist() == ["partner_a.csv", "partner_a.csv", "partner_b.csv"]
+
+    saved = json.loads((tmp_path / "mappings.json").read_text(encoding="utf-8"))
+    assert len(saved["mappings"]) == 2
+    reloaded = ColumnMappingCache(tmp_path / "mappings.json")
+    reloaded.resolve(["FacilityName", "Street_Address", "City", "country_name", "Latitude", "Longitude"])
+    assert not reloaded.dirty
+
+
+def test_mapping_cache_discarded_when_rules_change(tmp_path) -> None:
+    path = tmp_path / "mappings.json"
+    header = ["Street_Address"]
+    stale = {"rules_version": "old", "mappings": {header_signature(header): {"street": []}}}
+    path.write_text(json.dumps(stale), encoding="utf-8")
+
+    cache = ColumnMappingCache(path)
+    assert cache.resolve(header)["street"] == ["Street_Address"]
+    cache.save()
+    assert json.loads(path.read_text(encoding="utf-8"))["rules_version"] == MAPPING_RULES_VERSION
+
+
+def test_files_sharing_a_source_label_stay_distinguishable(tmp_path) -> None:
+    for stem in ("feed_east", "feed_west"):
+        (tmp_path / f"{stem}.csv").write_text(
+            f"name,city,country,lat,lon,source\n{stem} depot,Austin,US,30.27,-97.74,partner_x\n",
+            encoding="utf-8",
+        )
+    out, _ = ingest_sources(discover_sources(tmp_path), max_workers=1)
+    assert out["source"].tolist() == ["partner_x", "partner_x"]
+    assert out["source_file"].tolist() == ["feed_east.csv", "feed_west.csv"]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("polars")
+
+from facility_registry.boundaries import check_country_consistency
+from facility_registry.io import read_raw
+from facility_registry.lazy import collect_qa_metrics_lazy, normalize_csv_lazy
+from facility_registry.normalize import normalize_dataframe
+from facility_registry.qa import collect_qa_metrics
+
+RAW = "data/raw/facilities_raw.csv"
+
+
+def _assert_same_frame(left: pd.DataFrame, right: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(left.astype(object), right.astype(object), check_dtype=False)
+
+
+def test_normalize_matches_pandas_on_raw_file() -> None:
+    expected, expected_fixes = normalize_dataframe(read_raw(RAW))
+    result, fixes = normalize_csv_lazy(RAW)
+    assert fixes == expected_fixes
+    _assert_same_frame(result, expected)
+
+
+def test_normalize_matches_pandas_on_messy_values(tmp_path) -> None:
+    path = tmp_path / "raw.csv"
+    pd.DataFrame(
+        {
+            "Name": [" Alpha | Hub ", None, "Beta;;Port", "Gamma"],
+            "facility_name": [None, "Delta  Yard", None, None],
+            "FacilityType": ["Warehouse", "PORT", "", "airport"],
+            "Country": ["usa", "Deutschland", "xx-land", None],
+            "ZIP": ["01234", "", "9", "12345"],
+            "Latitude": ["12,5", "200", "abc", "-."],
+            "lng": ["45.1", "45", "3", "181"],
+            "source": ["", "feed_a", None, "feed_b"],
+        }
+    ).to_csv(path, index=False)
+    expected, expected_fixes = normalize_dataframe(read_raw(path))
+    result, fixes = normalize_csv_lazy(path)
+    assert fixes == expected_fixes
+    _assert_same_frame(result, expected)
+
+
+def test_qa_metrics_match_pandas(tmp_path) -> None:
+    cleaned, _ = normalize_dataframe(read_raw(RAW))
+    cleaned["raw_lat"] = cleaned["lat"] + 0.01
+    cleaned["raw_lon"] = cleaned["lon"]
+    cleaned["duplicate_group_id"] = ["DG-0001" if i % 7 == 0 else "" for i in range(len(cleaned))]
+    cleaned["is_canonical_record"] = [i % 7 != 0 or i == 0 for i in range(len(cleaned))]
+    cleaned["geocode_method"] = ["cached_geocode" if i % 3 == 0 else "raw_coords" for i in range(len(cleaned))]
+    cleaned = check_country_consistency(cleaned)
+    interim = tmp_path / "cleaned.csv"
+    cleaned.to_csv(interim, index=False)
+
+    expected = collect_qa_metrics(pd.read_csv(RAW), pd.read_csv(interim))
+    result = collect_qa_metrics_lazy(RAW, interim)
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            _assert_same_frame(result[key], value)
+        elif isinstance(value, pd.Series):
+            pd.testing.assert_series_equal(result[key], value, check_dtype=False, check_names=False, check_index_type=False)
+        else:
+            assert result[key] == value, key
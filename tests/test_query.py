@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from facility_registry.qa import haversine_km
+from facility_registry.query import FacilityIndex
+
+
+def _registry(n: int = 500, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "facility_id": [f"FAC-{i:08X}" for i in range(n)],
+            "facility_name": [f"Facility {i}" for i in range(n)],
+            "facility_type": rng.choice(["warehouse", "port", "airport"], size=n),
+            "country_iso2": rng.choice(["US", "DE", "JP"], size=n),
+            "operator": rng.choice(["Asteron Logistics", "Nimbus Freight"], size=n),
+            "lat": rng.uniform(-80, 80, size=n),
+            "lon": rng.uniform(-180, 180, size=n),
+            "has_valid_coords": True,
+            "is_canonical_record": True,
+        }
+    )
+
+
+def test_radius_matches_brute_force() -> None:
+    df = _registry()
+    index = FacilityIndex.from_frame(df)
+    points = np.array([[10.0, 179.5], [-45.0, -20.0], [78.0, 0.0]])
+    hits = index.within_radius(points[:, 0], points[:, 1], 1500.0, facility_type="warehouse")
+    for q, (lat, lon) in enumerate(points):
+        dist = haversine_km(lat, lon, df["lat"].to_numpy(), df["lon"].to_numpy())
+        expected = set(df.loc[(dist <= 1500.0) & (df["facility_type"] == "warehouse"), "facility_id"])
+        assert set(hits.loc[hits["query_idx"] == q, "facility_id"]) == expected
+
+
+def test_nearest_matches_brute_force_and_round_trips(tmp_path) -> None:
+    df = _registry()
+    path = tmp_path / "index.npz"
+    FacilityIndex.from_frame(df).save(path)
+    index = FacilityIndex.load(path)
+    rng = np.random.default_rng(1)
+    lat, lon = rng.uniform(-85, 85, 50), rng.uniform(-180, 180, 50)
+    result = index.nearest(lat, lon, k=3, country_iso2=["DE", "JP"])
+    eligible = df[df["country_iso2"].isin(["DE", "JP"])]
+    for q in range(50):
+        dist = haversine_km(lat[q], lon[q], eligible["lat"].to_numpy(), eligible["lon"].to_numpy())
+        expected = eligible["facility_id"].to_numpy()[np.argsort(dist)[:3]].tolist()
+        assert result.loc[result["query_idx"] == q, "facility_id"].tolist() == expected
+
+
+def test_bbox_across_antimeridian() -> None:
+    df = _registry()
+    index = FacilityIndex.from_frame(df)
+    hits = index.within_bbox(170.0, -10.0, -170.0, 10.0)
+    in_box = df["lat"].between(-10, 10) & ((df["lon"] >= 170) | (df["lon"] <= -170))
+    assert set(hits["facility_id"]) == set(df.loc[in_box, "facility_id"])
+
+
+def test_selective_filter_batch_uses_matching_records_only() -> None:
+    df = _registry(n=20_000)
+    rare = [11, 4_000, 17_500]
+    df.loc[rare, "operator"] = "Rare Haulage"
+    index = FacilityIndex.from_frame(df)
+    rng = np.random.default_rng(3)
+    lat, lon = rng.uniform(-85, 85, 2_000), rng.uniform(-180, 180, 2_000)
+
+    result = index.nearest(lat, lon, k=2, operator="Rare Haulage")
+    assert len(result) == 4_000
+    assert set(result["facility_id"]) <= set(df.loc[rare, "facility_id"])
+    for q in (0, 999, 1_999):
+        dist = haversine_km(lat[q], lon[q], df.loc[rare, "lat"].to_numpy(), df.loc[rare, "lon"].to_numpy())
+        expected = df.loc[rare, "facility_id"].to_numpy()[np.argsort(dist)[:2]].tolist()
+        assert result.loc[result["query_idx"] == q, "facility_id"].tolist() == expected
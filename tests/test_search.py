@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from facility_registry.search import SearchIndex
+
+
+def _registry() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "facility_id": ["FAC-00000001", "FAC-00000002", "FAC-00000003", "FAC-00000004"],
+            "facility_name": ["Kalten Airport 1", "Kalten Port 2", "Mason Warehouse 0", "Kalten Airport 1"],
+            "address_full": [
+                "8938 Foundry Rd, Kalten, Bavaria, 38893, DE",
+                "12 Canal Rd, Kalten, Bavaria, 38893, DE",
+                "4022 Transit Rd, Mason, California, 28289, US",
+                "8938 Foundry Rd, Kalten, Bavaria, 38893, DE",
+            ],
+            "country_iso2": ["DE", "DE", "US", "DE"],
+            "is_canonical_record": [True, True, True, False],
+        }
+    )
+
+
+def test_search_reranks_candidates_and_skips_non_canonical(tmp_path) -> None:
+    path = tmp_path / "search.npz"
+    SearchIndex.from_frame(_registry()).save(path)
+    index = SearchIndex.load(path)
+    assert len(index) == 3
+
+    hits = index.search("Kalten-Airprt 1", "8938 Foundry Road, Kalten", country_iso2="DE", limit=2)
+    assert hits["facility_id"].tolist() == ["FAC-00000001", "FAC-00000002"]
+    assert hits["score"].iloc[0] > hits["score"].iloc[1]
+
+    assert index.search("Mason Warehouse", country_iso2="DE").empty
+    assert index.search("zzzz").empty
+
+    # A tight posting budget keeps only the rarest terms, which still identify the record.
+    assert index.search("Mason Warehouse", max_postings=1)["facility_id"].tolist() == ["FAC-00000003"]
+
+
+def test_match_records_one_row_per_input() -> None:
+    index = SearchIndex.from_frame(_registry())
+    incoming = pd.DataFrame(
+        {
+            "facility_name": ["mason warehouse", "KALTEN PORT 2"],
+            "address_full": ["4022 Transit Rd, Mason", ""],
+        }
+    )
+    matches = index.match_records(incoming)
+    assert matches["query_idx"].tolist() == [0, 1]
+    assert matches["facility_id"].tolist() == ["FAC-00000003", "FAC-00000002"]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pandas as pd
+
+from facility_registry import REQUIRED_SCHEMA
+from facility_registry.io import atomic_write
+from facility_registry.service import (
+    MAX_NEAREST_BATCH,
+    MAX_SEARCH_BATCH,
+    RegistryService,
+    _runs_inline,
+    dispatch,
+    load_snapshot,
+)
+
+
+def _write_registry(path) -> None:
+    rows = []
+    for i, (name, lat, lon) in enumerate([("Mason Warehouse 0", 31.2, 57.7), ("Kalten Airport 1", 5.4, -49.9), ("Aokawa Port 2", 35.0, 135.0)]):
+        row = {col: "" for col in REQUIRED_SCHEMA}
+        row.update(
+            facility_id=f"FAC-0000000{i}",
+            facility_name=name,
+            facility_type=name.split()[1].lower(),
+            country_iso2="US",
+            postal_code="01234",
+            lat=lat,
+            lon=lon,
+            has_valid_coords=True,
+            is_canonical_record=True,
+        )
+        rows.append(row)
+    pd.DataFrame(rows, columns=REQUIRED_SCHEMA).to_csv(path, index=False)
+
+
+def test_dispatch_routes(tmp_path) -> None:
+    csv = tmp_path / "master.csv"
+    _write_registry(csv)
+    snap = load_snapshot(csv, tmp_path / "missing_index.npz", tmp_path / "missing_search.npz")
+
+    status, body = dispatch(snap, "GET", "/facilities/FAC-00000001")
+    assert status == 200 and json.loads(body)["facility_name"] == "Kalten Airport 1"
+    assert json.loads(body)["postal_code"] == "01234"
+    assert dispatch(snap, "GET", "/facilities/FAC-FFFFFFFF")[0] == 404
+
+    status, body = dispatch(snap, "POST", "/facilities", b'{"facility_ids": ["FAC-00000002", "nope"]}')
+    results = json.loads(body)["results"]
+    assert results[0]["facility_name"] == "Aokawa Port 2" and results[1] is None
+
+    status, body = dispatch(snap, "GET", "/search?q=kalten%20airprt&limit=1")
+    assert json.loads(body)["results"][0]["facility"]["facility_id"] == "FAC-00000001"
+    status, body = dispatch(snap, "POST", "/search", b'{"queries": ["aokawa port", {"facility_name": "mason warehous"}], "limit": 1}')
+    assert [r[0]["facility"]["facility_id"] for r in json.loads(body)["results"]] == ["FAC-00000002", "FAC-00000000"]
+
+    status, body = dispatch(snap, "POST", "/nearest", b'{"points": [[35.1, 135.1], [31, 57]], "k": 1, "facility_type": "warehouse"}')
+    hits = json.loads(body)["results"]
+    assert [h[0]["facility"]["facility_id"] for h in hits] == ["FAC-00000000", "FAC-00000000"]
+    status, body = dispatch(snap, "GET", "/nearest?lat=5.5&lon=-49.8&k=2")
+    hits = json.loads(body)["results"]
+    assert [h["facility"]["facility_id"] for h in hits] == ["FAC-00000001", "FAC-00000000"]
+    assert hits[0]["distance_km"] < hits[1]["distance_km"]
+
+    assert dispatch(snap, "GET", "/nearest?lat=abc&lon=1")[0] == 400
+    assert dispatch(snap, "DELETE", "/search")[0] == 405
+    assert dispatch(snap, "GET", "/search?q=kalten&limit=-1")[0] == 400
+    assert dispatch(snap, "POST", "/search", b'{"queries": ["kalten"], "limit": 0}')[0] == 400
+    too_many = json.dumps({"queries": ["x"] * (MAX_SEARCH_BATCH + 1)}).encode()
+    assert dispatch(snap, "POST", "/search", too_many)[0] == 413
+    too_many = json.dumps({"points": [[0, 0]] * (MAX_NEAREST_BATCH + 1)}).encode()
+    assert dispatch(snap, "POST", "/nearest", too_many)[0] == 413
+
+
+def test_only_id_lookups_run_on_the_event_loop() -> None:
+    assert _runs_inline("GET", "/facilities/FAC-00000001")
+    assert _runs_inline("POST", "/facilities")
+    assert not _runs_inline("POST", "/search")
+    assert not _runs_inline("GET", "/nearest?lat=1&lon=2")
+
+
+def test_server_keep_alive_round_trip(tmp_path) -> None:
+    csv = tmp_path / "master.csv"
+    _write_registry(csv)
+    service = RegistryService(csv, tmp_path / "missing_index.npz", tmp_path / "missing_search.npz")
+
+    async def run() -> list[bytes]:
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        bodies = []
+        for target in ["/health", "/facilities/FAC-00000000"]:
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            bodies.append(await reader.readexactly(length))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return bodies
+
+    health, record = asyncio.run(run())
+    assert json.loads(health)["records"] == 3
+    assert json.loads(record)["facility_id"] == "FAC-00000000"
+
+
+def test_atomic_write_keeps_previous_file_on_failure(tmp_path) -> None:
+    target = tmp_path / "master.csv"
+    target.write_text("old")
+    try:
+        with atomic_write(target) as tmp:
+            tmp.write_text("partial")
+            raise RuntimeError("export interrupted")
+    except RuntimeError:
+        pass
+    assert target.read_text() == "old"
+    with atomic_write(target) as tmp:
+        tmp.write_text("new")
+    assert target.read_text() == "new"
+    assert [p.name for p in tmp_path.iterdir()] == ["master.csv"]
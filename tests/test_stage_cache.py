@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from facility_registry.stage_cache import StageCache, run_stage
+
+
+def _stage(
+    tmp_path, calls: list[str], value: str, params: dict, force: bool = False, max_size_mb: int = 1, code_paths=()
+) -> bool:
+    src = tmp_path / "in.txt"
+    out = tmp_path / "out" / "result.txt"
+
+    def build() -> None:
+        calls.append(value)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(src.read_text() + value)
+
+    cache_cfg = {"dir": str(tmp_path / "cache"), "max_size_mb": max_size_mb}
+    return run_stage("demo", build, [src], [out], params, cache_cfg, force=force, code_paths=code_paths)
+
+
+def test_unchanged_inputs_restore_from_cache(tmp_path) -> None:
+    (tmp_path / "in.txt").write_text("a")
+    calls: list[str] = []
+    assert _stage(tmp_path, calls, "1", {"k": 1}) is False
+    (tmp_path / "out" / "result.txt").unlink()
+    assert _stage(tmp_path, calls, "1", {"k": 1}) is True
+    assert (tmp_path / "out" / "result.txt").read_text() == "a1"
+    assert calls == ["1"]
+
+    assert _stage(tmp_path, calls, "2", {"k": 2}) is False
+    (tmp_path / "in.txt").write_text("b")
+    assert _stage(tmp_path, calls, "3", {"k": 2}) is False
+    assert _stage(tmp_path, calls, "4", {"k": 2}, force=True) is False
+    assert calls == ["1", "2", "3", "4"]
+
+
+def test_eviction_keeps_cache_under_limit(tmp_path) -> None:
+    cache = StageCache(tmp_path / "cache", max_bytes=250)
+    for i in range(5):
+        out = tmp_path / f"out{i}.bin"
+        out.write_bytes(bytes([i]) * 100)
+        cache.store(f"key{i}", "demo", [out])
+    entries = sorted(p.stem for p in (tmp_path / "cache" / "entries").glob("*.json"))
+    assert entries == ["key3", "key4"]
+    assert sum(p.stat().st_size for p in (tmp_path / "cache" / "objects").glob("*/*")) <= 250
+
+
+def test_only_listed_code_invalidates(tmp_path) -> None:
+    (tmp_path / "in.txt").write_text("a")
+    used, unused = tmp_path / "used.py", tmp_path / "unused.py"
+    used.write_text("X = 1\n")
+    unused.write_text("Y = 1\n")
+    calls: list[str] = []
+    assert _stage(tmp_path, calls, "1", {}, code_paths=[used]) is False
+    unused.write_text("Y = 2\n")
+    assert _stage(tmp_path, calls, "1", {}, code_paths=[used]) is True
+    used.write_text("X = 2\n")
+    assert _stage(tmp_path, calls, "2", {}, code_paths=[used]) is False
+    assert calls == ["1", "2"]
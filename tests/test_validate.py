@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from facility_registry import REQUIRED_SCHEMA
+from facility_registry.export import export_outputs
+from facility_registry.validate import apply_schema_defaults, compile_schema, validate_csv, validate_frame
+
+
+def _record(**overrides: object) -> dict[str, object]:
+    rec: dict[str, object] = {
+        "facility_id": "FAC-0A1B2C3D",
+        "facility_name": "Mason Warehouse 0",
+        "facility_type": "warehouse",
+        "operator": "Kiteway Cargo",
+        "street": "4022 Transit Rd",
+        "city": "Mason",
+        "state_region": "California",
+        "postal_code": "28289",
+        "country_iso2": "US",
+        "address_full": "4022 Transit Rd, Mason, California, 28289, US",
+        "lat": 31.28,
+        "lon": 57.7,
+        "has_valid_coords": True,
+        "duplicate_group_id": "",
+        "is_canonical_record": True,
+        "geocode_method": "raw_coords",
+        "geocode_confidence": 0.9,
+        "source": "synthetic_v1",
+        "updated_at": "2024-01-01",
+    }
+    rec.update(overrides)
+    return rec
+
+
+def test_bad_rows_are_quarantined_with_reasons() -> None:
+    df = pd.DataFrame(
+        [
+            _record(),
+            _record(facility_type="spaceport"),
+            _record(lat=123.0, geocode_confidence=None),
+            _record(facility_id="", duplicate_group_id="DG-0001"),
+        ]
+    )
+    valid, bad = validate_frame(df, compile_schema(), chunksize=2)
+    assert list(valid.index) == [0]
+    assert list(bad.index) == [1, 2, 3]
+    assert bad.loc[1, "validation_errors"] == "facility_type:allowed"
+    assert bad.loc[2, "validation_errors"] == "lat:range;geocode_confidence:null"
+    assert bad.loc[3, "validation_errors"] == "facility_id:null"
+
+
+def test_defaults_fill_missing_columns() -> None:
+    df = pd.DataFrame([_record()]).drop(columns=["duplicate_group_id", "geocode_confidence"])
+    df = apply_schema_defaults(df)
+    valid, bad = validate_frame(df[REQUIRED_SCHEMA])
+    assert len(valid) == 1 and bad.empty
+
+
+def test_export_without_geocode_stage(tmp_path) -> None:
+    df = pd.DataFrame([_record(), _record(facility_id="FAC-0A1B2C3E")])
+    df = apply_schema_defaults(df.drop(columns=["geocode_method", "geocode_confidence"]))
+    valid, bad = validate_frame(df)
+    assert bad.empty
+    export_outputs(valid, tmp_path / "master.csv", tmp_path / "master.gpkg", layer_name="facilities", crs="EPSG:4326")
+    out = pd.read_csv(tmp_path / "master.csv")
+    assert len(out) == 2
+    assert out["geocode_method"].tolist() == ["none", "none"]
+
+
+def test_validate_csv_streams_chunks(tmp_path) -> None:
+    src = tmp_path / "in.csv"
+    rows = [_record() for _ in range(5)] + [_record(country_iso2="usa")]
+    pd.DataFrame(rows).to_csv(src, index=False)
+    counts = validate_csv(src, tmp_path / "ok.csv", tmp_path / "bad.csv", chunksize=2)
+    assert counts == {"rows": 6, "valid": 5, "quarantined": 1}
+    bad = pd.read_csv(tmp_path / "bad.csv")
+    assert bad["validation_errors"].tolist() == ["country_iso2:pattern"]
+
+
+def test_whitespace_only_values_count_as_null() -> None:
+    df = pd.DataFrame([_record(), _record(facility_name="   "), _record(facility_name="\t")])
+    valid, bad = validate_frame(df)
+    assert list(valid.index) == [0]
+    assert bad["validation_errors"].tolist() == ["facility_name:null", "facility_name:null"]